@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+Extraction benchmark: synthetic transcript corpora and timed runs
+
+    benchmark.py generate CORPUS [--sessions N] [--messages N] ...
+    benchmark.py run [--corpus CORPUS] [--output report.json] [--repeat N]
+    benchmark.py compare OLD.json NEW.json
+
+`run` generates a corpus (unless one is given) and times each extractor in
+its own process against it, with every input and output path redirected
+into a scratch directory. Each target runs cold (empty caches, full parse)
+and warm (second run, incremental). The JSON report records wall time,
+lines/s, MB/s and peak RSS per target, plus the commit it was run on, so
+reports from different commits can be compared.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import runpy
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+
+TARGETS = [
+    'extract-chat.py',
+    'extract-logs.py',
+    'extract-usage.py',
+    'extract-transcripts.py',
+    'generate-data.py',
+]
+
+MODELS = ['claude-opus-4-5', 'claude-sonnet-4-5', 'gpt-5.2']
+WORDS = ("the a to of and in is it for on that with as this was at be by not are from or have an "
+         "session memory cron dashboard token file skill agent gateway heartbeat message update "
+         "config server usage model cost error result check summary weather email task").split()
+
+# Corpus generation
+
+def random_text(rng, mean_chars):
+    """Words up to a length drawn around `mean_chars` (log-normal, long tail)"""
+    length = max(1, int(rng.lognormvariate(0, 1) * mean_chars / 1.65))
+    words = []
+    size = 0
+    while size < length:
+        word = rng.choice(WORDS)
+        words.append(word)
+        size += len(word) + 1
+    return ' '.join(words)
+
+def usage_record(rng, model):
+    inp = rng.randint(50, 20000)
+    out = rng.randint(10, 4000)
+    cache_r = rng.choice([0, 0, rng.randint(1000, 100000)])
+    cache_w = rng.choice([0, rng.randint(100, 20000)])
+    cost = {
+        'input': inp * 3e-6,
+        'output': out * 15e-6,
+        'cacheRead': cache_r * 0.3e-6,
+        'cacheWrite': cache_w * 3.75e-6
+    }
+    cost['total'] = sum(cost.values())
+    return {'input': inp, 'output': out, 'cacheRead': cache_r, 'cacheWrite': cache_w,
+            'totalTokens': inp + out + cache_r + cache_w, 'cost': cost}
+
+def session_lines(rng, args, start):
+    """The JSONL lines of one synthetic session"""
+    session_id = str(uuid.UUID(int=rng.getrandbits(128)))
+    yield json.dumps({'type': 'session', 'version': 3, 'id': session_id,
+                      'timestamp': start.isoformat() + 'Z', 'cwd': '/home/moltbot/clawd'})
+    now = start
+    model = rng.choice(MODELS)
+    parent = None
+    count = max(1, int(rng.expovariate(1 / args.messages)))
+    for _ in range(count):
+        now += timedelta(seconds=rng.expovariate(1 / 90))
+        record_id = uuid.UUID(int=rng.getrandbits(128)).hex[:8]
+        timestamp = now.isoformat(timespec='milliseconds') + 'Z'
+        roll = rng.random()
+        if roll < 0.02:
+            model = rng.choice(MODELS)
+            yield json.dumps({'type': 'model_change', 'id': record_id, 'parentId': parent,
+                              'timestamp': timestamp, 'modelId': model})
+            continue
+        if roll < 0.35:
+            text = rng.choice(['HEARTBEAT', 'NO_REPLY']) if rng.random() < 0.1 else random_text(rng, args.text_size)
+            message = {'role': 'user', 'content': [{'type': 'text', 'text': text}]}
+        elif roll < 0.6:
+            message = {'role': 'toolResult', 'toolCallId': record_id,
+                       'content': [{'type': 'text', 'text': random_text(rng, args.tool_size)}]}
+        else:
+            content = [{'type': 'text', 'text': random_text(rng, args.text_size)}]
+            if rng.random() < 0.4:
+                content.append({'type': 'toolCall', 'id': record_id, 'name': 'exec',
+                                'arguments': {'command': random_text(rng, 40)}})
+            message = {'role': 'assistant', 'content': content, 'model': model}
+            if rng.random() < args.usage_ratio:
+                message['usage'] = usage_record(rng, model)
+        yield json.dumps({'type': 'message', 'id': record_id, 'parentId': parent,
+                          'timestamp': timestamp, 'message': message}, ensure_ascii=False)
+        parent = record_id
+        if rng.random() < args.malformed:
+            yield '{"type": "message", "timestamp": "' + timestamp[:10]
+
+def generate_corpus(root, args):
+    """Write sessions, memory files and skills under `root`; returns corpus stats"""
+    rng = random.Random(args.seed)
+    root = Path(root)
+    sessions_dir = root / 'sessions'
+    memory_dir = root / 'workspace' / 'memory'
+    skills_dir = root / 'workspace' / 'skills'
+    for directory in (sessions_dir, memory_dir, skills_dir):
+        directory.mkdir(parents=True, exist_ok=True)
+
+    lines = 0
+    size = 0
+    epoch = datetime(2026, 1, 1)
+    for _ in range(args.sessions):
+        start = epoch + timedelta(seconds=rng.randint(0, 120 * 86400))
+        session = list(session_lines(rng, args, start))
+        data = '\n'.join(session) + '\n'
+        path = sessions_dir / f"{json.loads(session[0])['id']}.jsonl"
+        path.write_text(data, encoding='utf-8')
+        lines += len(session)
+        size += len(data.encode('utf-8'))
+
+    for day in range(args.memory_files):
+        date = (epoch + timedelta(days=day)).strftime('%Y-%m-%d')
+        (memory_dir / f"{date}.md").write_text(f"# {date}\n\n{random_text(rng, 3000)}\n", encoding='utf-8')
+    (root / 'workspace' / 'MEMORY.md').write_text("# Memory\n\n" + random_text(rng, 5000) + "\n")
+    for name in ('weather', 'github', 'tmux', 'docker'):
+        (skills_dir / name).mkdir(exist_ok=True)
+        (skills_dir / name / 'SKILL.md').write_text(f"# {name}\n> {random_text(rng, 60)}\n")
+
+    stats = {'sessions': args.sessions, 'lines': lines, 'bytes': size, 'seed': args.seed,
+             'messages': args.messages, 'malformed': args.malformed}
+    (root / 'corpus.json').write_text(json.dumps(stats, indent=2))
+    return stats
+
+# Running one target (in a child process)
+
+def redirect_paths(corpus, work):
+    """Point every module's input/output paths at the corpus and `work`"""
+    sys.path.insert(0, str(HERE))
+    import extractors
+    import output
+    import skills
+    import store
+    import transcripts
+    import usage_archive
+
+    api_dir = work / 'api'
+    cache_dir = work / '.cache'
+    transcripts.SESSIONS_DIR = corpus / 'sessions'
+    extractors.API_DIR = output.API_DIR = api_dir
+    extractors.CACHE_DIR = store.CACHE_DIR = skills.CACHE_DIR = usage_archive.CACHE_DIR = cache_dir
+    usage_archive.ARCHIVE_DIR = cache_dir / 'usage-archive'
+    skills.CACHE_FILE = cache_dir / 'skills-cache.json'
+    skills.SKILLS_DIRS = [corpus / 'workspace' / 'skills']
+    extractors.UsageExtractor.STATE_FILE = cache_dir / 'usage-state.json'
+    store.DB_PATH = cache_dir / 'dashboard.db'
+    return api_dir
+
+def run_target(target, corpus, work):
+    corpus = Path(corpus)
+    work = Path(work)
+    api_dir = redirect_paths(corpus, work)
+    sys.argv = [target]
+    if target == 'generate-data.py':
+        import importlib.util
+        spec = importlib.util.spec_from_file_location('generate_data', HERE / target)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        module.API_DIR = api_dir
+        module.WORKSPACE = corpus / 'workspace'
+        module.MEMORY_DIR = corpus / 'workspace' / 'memory'
+        module.main()
+    else:
+        runpy.run_path(str(HERE / target), run_name='__main__')
+
+# Timing
+
+def timed_run(target, corpus, work):
+    """Run a target in a child process; returns wall time, peak RSS and exit code"""
+    cmd = [sys.executable, str(Path(__file__).resolve()), 'child', target, str(corpus), str(work)]
+    start = time.perf_counter()
+    proc = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    stderr = proc.stderr.read()
+    _, status, usage = os.wait4(proc.pid, 0)
+    wall = time.perf_counter() - start
+    proc.returncode = os.waitstatus_to_exitcode(status)
+    if proc.returncode:
+        print(f"{target} failed ({proc.returncode}):\n{stderr.decode(errors='replace')}", file=sys.stderr)
+    # ru_maxrss is in KiB on Linux (the max of the child and its workers)
+    return {'wall': wall, 'rssMB': usage.ru_maxrss / 1024, 'cpu': usage.ru_utime + usage.ru_stime,
+            'exitCode': proc.returncode}
+
+def summarize(runs, input_lines, input_bytes):
+    wall = statistics.median(r['wall'] for r in runs)
+    return {
+        'wallSeconds': round(wall, 4),
+        'cpuSeconds': round(statistics.median(r['cpu'] for r in runs), 4),
+        'linesPerSec': round(input_lines / wall) if input_lines else None,
+        'mbPerSec': round(input_bytes / 1e6 / wall, 2),
+        'peakRssMB': round(max(r['rssMB'] for r in runs), 1),
+        'runs': len(runs),
+        'failed': sum(1 for r in runs if r['exitCode'])
+    }
+
+def workspace_bytes(corpus):
+    return sum(p.stat().st_size for p in (Path(corpus) / 'workspace').rglob('*') if p.is_file())
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=HERE, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run_benchmark(args):
+    scratch = Path(tempfile.mkdtemp(prefix='botch-bench-'))
+    try:
+        if args.corpus:
+            corpus = Path(args.corpus)
+            stats = json.loads((corpus / 'corpus.json').read_text())
+        else:
+            corpus = scratch / 'corpus'
+            print(f"Generating corpus ({args.sessions} sessions)...")
+            stats = generate_corpus(corpus, args)
+        print(f"Corpus: {stats['sessions']} sessions, {stats['lines']} lines, {stats['bytes'] / 1e6:.1f} MB")
+
+        results = {}
+        for target in args.targets:
+            if target == 'generate-data.py':
+                lines, size = 0, workspace_bytes(corpus)
+            else:
+                lines, size = stats['lines'], stats['bytes']
+            cold, warm = [], []
+            for i in range(args.repeat):
+                work = scratch / f"work-{target}-{i}"
+                cold.append(timed_run(target, corpus, work))
+                warm.append(timed_run(target, corpus, work))
+                shutil.rmtree(work, ignore_errors=True)
+            results[target] = {'cold': summarize(cold, lines, size), 'warm': summarize(warm, lines, size)}
+            c, w = results[target]['cold'], results[target]['warm']
+            print(f"{target:24} cold {c['wallSeconds']:8.3f}s {c['mbPerSec']:8.2f} MB/s {c['peakRssMB']:7.1f} MB RSS"
+                  f"   warm {w['wallSeconds']:8.3f}s")
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+
+    report = {
+        'generatedAt': datetime.utcnow().isoformat() + 'Z',
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'corpus': stats,
+        'results': results
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Report written to {args.output}")
+
+def compare(old_path, new_path):
+    """Print wall-time and RSS ratios between two reports"""
+    old = json.loads(Path(old_path).read_text())
+    new = json.loads(Path(new_path).read_text())
+    print(f"{old.get('commit')} -> {new.get('commit')}")
+    if old['corpus'] != new['corpus']:
+        print("Warning: the reports were made on different corpora")
+    for target, result in new['results'].items():
+        if target not in old['results']:
+            continue
+        for phase in ('cold', 'warm'):
+            a, b = old['results'][target][phase], result[phase]
+            speedup = a['wallSeconds'] / b['wallSeconds'] if b['wallSeconds'] else float('inf')
+            print(f"{target:24} {phase:4} {a['wallSeconds']:8.3f}s -> {b['wallSeconds']:8.3f}s "
+                  f"({speedup:5.2f}x)  RSS {a['peakRssMB']:7.1f} -> {b['peakRssMB']:7.1f} MB")
+
+def add_corpus_args(parser):
+    parser.add_argument('--sessions', type=int, default=200, help='number of sessions (default: 200)')
+    parser.add_argument('--messages', type=int, default=300, help='mean records per session (default: 300)')
+    parser.add_argument('--text-size', type=int, default=400, help='mean chars of a chat message (default: 400)')
+    parser.add_argument('--tool-size', type=int, default=2000, help='mean chars of a tool result (default: 2000)')
+    parser.add_argument('--usage-ratio', type=float, default=0.9,
+                        help='share of assistant messages with usage (default: 0.9)')
+    parser.add_argument('--malformed', type=float, default=0.01, help='share of malformed lines (default: 0.01)')
+    parser.add_argument('--memory-files', type=int, default=60, help='number of daily memory files (default: 60)')
+    parser.add_argument('--seed', type=int, default=1, help='random seed (default: 1)')
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the transcript extractors on synthetic data")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    gen = sub.add_parser('generate', help='write a synthetic corpus')
+    gen.add_argument('corpus', help='directory to create')
+    add_corpus_args(gen)
+
+    run = sub.add_parser('run', help='time the extractors and write a JSON report')
+    run.add_argument('--corpus', help='existing corpus (default: generate one)')
+    run.add_argument('--output', default='benchmark-report.json', help='report file (default: %(default)s)')
+    run.add_argument('--repeat', type=int, default=3, help='runs per target, median reported (default: 3)')
+    run.add_argument('--targets', nargs='+', default=TARGETS, choices=TARGETS, metavar='SCRIPT',
+                     help='scripts to time (default: all)')
+    add_corpus_args(run)
+
+    cmp = sub.add_parser('compare', help='compare two reports')
+    cmp.add_argument('old')
+    cmp.add_argument('new')
+
+    child = sub.add_parser('child', help='(internal) run one target with redirected paths')
+    child.add_argument('target')
+    child.add_argument('corpus')
+    child.add_argument('work')
+
+    args = parser.parse_args()
+    if args.command == 'generate':
+        stats = generate_corpus(args.corpus, args)
+        print(f"Wrote {stats['sessions']} sessions, {stats['lines']} lines, {stats['bytes'] / 1e6:.1f} MB")
+    elif args.command == 'run':
+        run_benchmark(args)
+    elif args.command == 'compare':
+        compare(args.old, args.new)
+    else:
+        run_target(args.target, args.corpus, args.work)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+/**
+ * Botch Dashboard - background tasks
+ * Markdown rendering and session log filtering. index.html runs this file as
+ * a Web Worker; where workers are unavailable it is loaded as a plain script
+ * and the same tasks run on the page.
+ */
+
+const inWorker = typeof window === 'undefined' && typeof importScripts === 'function';
+if (inWorker) importScripts('https://cdn.jsdelivr.net/npm/marked/marked.min.js');
+
+// Texts of the messages of the open session log, oldest first
+let logTexts = [];
+
+const dashboardTasks = {
+  markdown: (text) => marked.parse(text || ''),
+
+  setLog: (texts) => {
+    logTexts = texts;
+    return logTexts.length;
+  },
+
+  prependLog: (texts) => {
+    logTexts = texts.concat(logTexts);
+    return logTexts.length;
+  },
+
+  // Indices of the log messages containing `query` (case-insensitive)
+  filterLog: (query) => {
+    const q = query.toLowerCase();
+    const hits = [];
+    logTexts.forEach((text, i) => {
+      if (text && text.toLowerCase().includes(q)) hits.push(i);
+    });
+    return hits;
+  }
+};
+
+if (inWorker) {
+  self.onmessage = (e) => {
+    const { id, op, args } = e.data;
+    try {
+      self.postMessage({ id, result: dashboardTasks[op](...args) });
+    } catch (err) {
+      self.postMessage({ id, error: err.message });
+    }
+  };
+}
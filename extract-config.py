@@ -3,9 +3,10 @@
 Extract core configuration MD files for dashboard
 """
 
-import json
 from pathlib import Path
 
+import output
+
 WORKSPACE = Path("/home/moltbot/clawd")
 API_DIR = Path("/home/moltbot/clawd/dashboards/api")
 
@@ -34,8 +35,7 @@ def main():
         else:
             config_data[filename] = f"File not found: {filepath}"
     
-    with open(API_DIR / "config-files.json", "w") as f:
-        json.dump(config_data, f, ensure_ascii=False)
+    output.write_json("config-files.json", config_data)
     
     print(f"Extracted {len(config_data)} config files")
 
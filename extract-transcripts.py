@@ -0,0 +1,21 @@
+#!/usr/bin/env python3
+"""
+Extract chat history, session logs and usage in one pass over the transcripts
+"""
+
+import argparse
+
+from extractors import ChatExtractor, LogsExtractor, UsageExtractor
+from transcripts import run
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('--workers', type=int, default=1,
+                        help='parse session files in N worker processes (default: 1)')
+    args = parser.parse_args()
+
+    run([ChatExtractor(sessions=10, limit=30), LogsExtractor(), UsageExtractor()],
+        workers=args.workers)
+
+if __name__ == "__main__":
+    main()
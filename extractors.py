@@ -0,0 +1,479 @@
+#!/usr/bin/env python3
+"""
+Transcript consumers producing the dashboard's chat, logs and usage data
+
+Each extractor plugs into transcripts.run(), which reads every session file
+once and feeds the records to all of them.
+"""
+
+import heapq
+import os
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+import output
+import store
+import usage_archive
+from transcripts import (Consumer, Session, Stub, checkpoint, dumps, loads, read_records_reverse,
+                         read_session_header, resume_offset)
+
+API_DIR = Path("/home/moltbot/clawd/dashboards/api")
+CACHE_DIR = Path("/home/moltbot/clawd/dashboards/.cache")
+SPOOL_BYTES = 4 * 1024 * 1024  # message text kept in memory before spilling to disk
+
+class ChatExtractor(Consumer):
+    """Recent messages of the most recently modified sessions -> chat-history.json
+
+    Does not take part in the forward pass: the messages are read backwards
+    from the end of each selected file, so the cost depends on `limit` and not
+    on the transcript's size.
+    """
+
+    def __init__(self, sessions=10, limit=30):
+        self.sessions = sessions
+        self.limit = limit
+        self.selected = []
+
+    def prepare(self, files):
+        recent = sorted(files, key=lambda f: f[1].st_mtime, reverse=True)[:self.sessions]
+        self.selected = [path for path, _ in recent]
+
+    def plan(self, path, stat):
+        return None
+
+    def extract_messages(self, filepath):
+        """The last `limit` messages of a transcript and its session header"""
+        messages = []
+        for record in read_records_reverse(filepath):
+            if isinstance(record, Session):
+                continue
+            text = record.text
+            if text and not text.startswith('HEARTBEAT'):
+                messages.append({
+                    'role': record.role,
+                    'text': text[:500] + ('...' if len(text) > 500 else ''),
+                    'timestamp': record.timestamp
+                })
+                if len(messages) >= self.limit:
+                    break
+        messages.reverse()
+        return messages, read_session_header(filepath)
+
+    def finish(self):
+        sessions_data = []
+        for path in self.selected:
+            try:
+                messages, info = self.extract_messages(path)
+            except Exception as e:
+                print(f"Error reading {path}: {e}")
+                continue
+            if messages:
+                sessions_data.append({
+                    'id': path.stem,
+                    'file': path.name,
+                    'messageCount': len(messages),
+                    'messages': messages,
+                    'info': info
+                })
+
+        output.write_json("chat-history.json", sessions_data)
+
+        print(f"Extracted chat history from {len(sessions_data)} sessions")
+
+class MessageSpool:
+    """The new messages of one transcript, in order
+
+    Messages are buffered in memory; once their text exceeds SPOOL_BYTES they
+    are spilled to a JSON-lines temp file, so a huge transcript is never held
+    in memory. Iterating yields them all once and removes the temp file.
+    """
+
+    def __init__(self):
+        self.buffer = []
+        self.buffered = 0
+        self.count = 0
+        self.path = None
+        self._file = None
+
+    def __getstate__(self):
+        # Passed from worker processes only after close()
+        return {**self.__dict__, '_file': None}
+
+    def append(self, message):
+        self.buffer.append(message)
+        self.buffered += len(message['text'])
+        self.count += 1
+        if self.buffered >= SPOOL_BYTES:
+            self.spill()
+
+    def spill(self):
+        if self._file is None:
+            fd, self.path = tempfile.mkstemp(prefix='botchboard-logs-', suffix='.jsonl')
+            self._file = os.fdopen(fd, 'wb')
+        self._file.writelines(dumps(m) + b'\n' for m in self.buffer)
+        self.buffer = []
+        self.buffered = 0
+
+    def close(self):
+        if self._file is not None:
+            self.spill()
+            self._file.close()
+            self._file = None
+
+    def discard(self):
+        self.close()
+        if self.path is not None:
+            os.unlink(self.path)
+            self.path = None
+
+    def __iter__(self):
+        if self.path is not None:
+            try:
+                with open(self.path, 'rb') as f:
+                    for line in f:
+                        yield loads(line)
+            finally:
+                self.discard()
+        yield from self.buffer
+
+class LogsExtractor(Consumer):
+    """Full user/assistant logs per session -> session store + sessions-index.json
+
+    Sessions and their messages are upserted into the SQLite store, resuming
+    each transcript from the offset parsed by the previous run. Unchanged
+    sessions are not touched. New messages are collected in a MessageSpool
+    and streamed into the store, so memory use does not depend on the size
+    of a session.
+    """
+
+    def __init__(self):
+        self.conn = None
+        self.checkpoints = {}
+        self.present = set()
+
+    def __getstate__(self):
+        # Worker processes only parse; the connection stays in the parent
+        return {**self.__dict__, 'conn': None}
+
+    def prepare(self, files):
+        self.conn = store.writer()
+        self.checkpoints = store.checkpoints(self.conn)
+        self.present = {path.stem for path, _ in files}
+
+    def plan(self, path, stat):
+        return resume_offset(self.checkpoints.get(path.stem), path, stat)
+
+    def begin(self, path, stat, start):
+        return {'start': start, 'messages': MessageSpool(), 'first': None, 'last': None}
+
+    def feed(self, state, record):
+        if isinstance(record, Session):
+            return
+        timestamp = record.timestamp
+        if timestamp:
+            if not state['first']:
+                state['first'] = timestamp
+            state['last'] = timestamp
+
+        if record.role not in ('user', 'assistant'):
+            return
+        text = record.text
+        if text and not text.startswith('HEARTBEAT'):
+            # Skip tool results and NO_REPLY for cleaner logs
+            if text == 'NO_REPLY' or text.startswith('{'):
+                return
+            state['messages'].append({
+                'role': record.role,
+                'text': text,
+                'timestamp': timestamp
+            })
+
+    def end(self, state, path, stat, offset):
+        state['messages'].close()
+        return {**state, **checkpoint(path, stat, offset)}
+
+    def merge(self, path, partial):
+        previous = self.checkpoints.get(path.stem)
+        rebuild = previous is None or partial['start'] == 0
+        first, last, count = partial['first'], partial['last'], partial['messages'].count
+        if not rebuild:
+            first = previous['firstMessage'] or first
+            last = last or previous['lastMessage']
+            count += previous['messageCount']
+
+        session = {
+            'id': path.stem,
+            'file': path.name,
+            'size': partial['size'],
+            'modified': partial['mtime'],
+            'firstMessage': first,
+            'lastMessage': last,
+            'messageCount': count,
+            **{k: partial[k] for k in ('inode', 'offset', 'headLen', 'head')}
+        }
+        store.save_session(self.conn, session, partial['messages'], rebuild)
+
+    def finish(self):
+        store.delete_sessions(self.conn, set(self.checkpoints) - self.present)
+        self.conn.commit()
+        summaries = store.list_sessions(self.conn)
+
+        # Static index for when the store cannot be queried
+        output.write_json("sessions-index.json", summaries)
+
+        # Per-session JSON dumps are superseded by the store: removed once,
+        # when the store is first filled
+        if not self.checkpoints:
+            for legacy in API_DIR.glob("session-*.json"):
+                legacy.unlink()
+
+        print(f"Extracted {len(summaries)} session logs")
+
+def parse_timestamp(timestamp):
+    try:
+        return datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+    except (AttributeError, ValueError):
+        return None
+
+class UsageExtractor(Consumer):
+    """Token usage and costs -> usage.json + hourly rollups in the store
+
+    Parsing is incremental: a checkpoint per session file (inode, size, parsed
+    byte offset and that file's partial aggregates) is kept in STATE_FILE, so
+    each run only reads lines appended since the previous run. Files that were
+    truncated or rotated are detected and rebuilt from scratch.
+
+    The usage of every call is also added to per-session, per-model hourly
+    buckets (sums plus token-size and latency histograms) in the store, which
+    `/api/usage.json?range=` queries. Latency is the time since the message
+    the call answered. Every call is also appended to usage_archive, the
+    columnar per-call archive behind `/api/usage-calls`.
+    """
+
+    STATE_FILE = CACHE_DIR / "usage-state.json"
+    STATE_VERSION = 2
+    RECENT_LIMIT = 50
+    # Lines without usage (tool results, user messages) are not decoded. This
+    # only applies when usage is extracted alone (extract-usage.py): the logs
+    # need every user/assistant line, so the combined pass decodes them all
+    needles = (b'"usage"',)
+
+    def __init__(self):
+        self.state = self.load_state()
+        self.files = {}
+        self.conn = None
+        self.archive = None
+
+    def __getstate__(self):
+        # Worker processes only parse; the connection and archive stay in the parent
+        return {**self.__dict__, 'conn': None, 'archive': None}
+
+    @staticmethod
+    def new_partial():
+        """Empty per-file aggregates"""
+        return {
+            'tokens': {'input': 0, 'output': 0, 'cacheRead': 0, 'cacheWrite': 0},
+            'cost': 0.0,
+            'byModel': {},
+            'byDay': {},
+            'recentCalls': [],
+            'lastTimestamp': None
+        }
+
+    def load_state(self):
+        """Load the checkpoint file, discarding it if unreadable or outdated"""
+        try:
+            with open(self.STATE_FILE, 'rb') as f:
+                state = loads(f.read())
+            if state.get('version') == self.STATE_VERSION:
+                return state
+        except (OSError, ValueError):
+            pass
+        return {'version': self.STATE_VERSION, 'files': {}}
+
+    def save_state(self):
+        """Write the checkpoint file atomically"""
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.STATE_FILE.with_suffix('.tmp')
+        with open(tmp_path, 'wb') as f:
+            f.write(dumps(self.state))
+        os.replace(tmp_path, self.STATE_FILE)
+
+    def prepare(self, files):
+        self.conn = store.writer()
+        self.archive = usage_archive.Writer()
+        # The rollups or the archive were lost (new or deleted store): rebuild everything
+        if not (store.has_usage(self.conn) and self.archive.meta['rows']) and any(f['byModel'] for f in self.state['files'].values()):
+            self.state['files'] = {}
+
+    def plan(self, path, stat):
+        entry = self.state['files'].get(path.name)
+        start = resume_offset(entry, path, stat)
+        if start is None:
+            self.files[path.name] = entry
+        return start
+
+    def begin(self, path, stat, start):
+        if start == 0:
+            partial = self.new_partial()
+        else:
+            entry = self.state['files'][path.name]
+            partial = {k: entry[k] for k in self.new_partial()}
+        # Bounded min-heap of the newest calls; the sequence number breaks
+        # timestamp ties in file order, like a stable sort would
+        partial['recentCalls'] = [(c['timestamp'], -i, c) for i, c in enumerate(partial['recentCalls'])]
+        heapq.heapify(partial['recentCalls'])
+        partial['seq'] = len(partial['recentCalls'])
+        partial['start'] = start
+        partial['buckets'] = {}
+        partial['calls'] = []
+        return partial
+
+    def feed(self, partial, record):
+        if isinstance(record, Session):
+            return
+        timestamp = record.timestamp
+        previous = partial['lastTimestamp']
+        if timestamp:
+            partial['lastTimestamp'] = timestamp
+        if isinstance(record, Stub):
+            return
+        usage = record.usage
+        if not usage:
+            return
+        model = record.model
+
+        inp = usage.get('input', 0)
+        out = usage.get('output', 0)
+        cache_r = usage.get('cacheRead', 0)
+        cache_w = usage.get('cacheWrite', 0)
+        cost_data = usage.get('cost', {})
+        cost = cost_data.get('total', 0) if isinstance(cost_data, dict) else 0
+
+        tokens = partial['tokens']
+        tokens['input'] += inp
+        tokens['output'] += out
+        tokens['cacheRead'] += cache_r
+        tokens['cacheWrite'] += cache_w
+        partial['cost'] += cost
+
+        tokens_total = inp + out
+        model_entry = partial['byModel'].setdefault(model, {'tokens': 0, 'cost': 0.0, 'calls': 0})
+        model_entry['tokens'] += tokens_total
+        model_entry['cost'] += cost
+        model_entry['calls'] += 1
+
+        if timestamp:
+            day_entry = partial['byDay'].setdefault(timestamp[:10], {'tokens': 0, 'cost': 0.0})
+            day_entry['tokens'] += tokens_total
+            day_entry['cost'] += cost
+
+        # Keep recent calls
+        if timestamp and tokens_total > 0:
+            item = (timestamp, -partial['seq'], {
+                'timestamp': timestamp,
+                'model': model,
+                'tokens': tokens_total,
+                'cost': cost
+            })
+            partial['seq'] += 1
+            if len(partial['recentCalls']) < self.RECENT_LIMIT:
+                heapq.heappush(partial['recentCalls'], item)
+            elif item > partial['recentCalls'][0]:
+                heapq.heapreplace(partial['recentCalls'], item)
+
+        when = parse_timestamp(timestamp)
+        when_ms = usage_archive.to_ms(when)
+        if when_ms is not None:
+            partial['calls'].append((when_ms, model, inp, out, cache_r, cache_w, cost))
+
+        if timestamp:
+            bucket = partial['buckets'].get((timestamp[:13], model))
+            if bucket is None:
+                bucket = [0, 0, 0, 0, 0.0, 0, store.histogram(), store.histogram()]
+                partial['buckets'][(timestamp[:13], model)] = bucket
+            bucket[0] += inp
+            bucket[1] += out
+            bucket[2] += cache_r
+            bucket[3] += cache_w
+            bucket[4] += cost
+            bucket[5] += 1
+            store.hist_add(bucket[6], tokens_total)
+            start, end = parse_timestamp(previous), when
+            if start and end and end >= start:
+                store.hist_add(bucket[7], (end - start).total_seconds() * 1000)
+
+    def end(self, partial, path, stat, offset):
+        partial['recentCalls'] = [c for _, _, c in sorted(partial['recentCalls'], reverse=True)]
+        del partial['seq']
+        return {**checkpoint(path, stat, offset), **partial}
+
+    def merge(self, path, entry):
+        buckets = entry.pop('buckets')
+        start = entry.pop('start')
+        store.save_usage(self.conn, path.stem, buckets, rebuild=start == 0)
+        if start == 0:
+            self.archive.drop([path.stem])
+        self.archive.append(path.stem, entry.pop('calls'))
+        self.files[path.name] = entry
+
+    def finish(self):
+        # Files that disappeared are dropped from the checkpoint and the store
+        vanished = {Path(name).stem for name in self.state['files']} - {Path(name).stem for name in self.files}
+        store.delete_usage(self.conn, vanished)
+        self.archive.drop(vanished)
+        self.archive.commit()
+        self.conn.commit()
+        self.state['files'] = self.files
+        self.save_state()
+
+        # Merge per-file aggregates in name order
+        total_tokens = {'input': 0, 'output': 0, 'cacheRead': 0, 'cacheWrite': 0}
+        total_cost = 0.0
+        by_model = {}
+        by_day = {}
+        recent_calls = []
+
+        for name in sorted(self.files):
+            partial = self.files[name]
+            for k in total_tokens:
+                total_tokens[k] += partial['tokens'][k]
+            total_cost += partial['cost']
+            for model, v in partial['byModel'].items():
+                entry = by_model.setdefault(model, {'tokens': 0, 'cost': 0.0, 'calls': 0})
+                entry['tokens'] += v['tokens']
+                entry['cost'] += v['cost']
+                entry['calls'] += v['calls']
+            for day, v in partial['byDay'].items():
+                entry = by_day.setdefault(day, {'tokens': 0, 'cost': 0.0})
+                entry['tokens'] += v['tokens']
+                entry['cost'] += v['cost']
+            recent_calls.extend(partial['recentCalls'])
+
+        # Newest calls across all files (same order as a stable sort)
+        recent_calls = heapq.nlargest(self.RECENT_LIMIT, recent_calls, key=lambda x: x['timestamp'])
+
+        # Convert by_day to sorted list
+        days_list = [{'date': k, **v} for k, v in sorted(by_day.items(), reverse=True)][:14]
+
+        # Convert by_model to list
+        models_list = [{'model': k, **v} for k, v in sorted(by_model.items(), key=lambda x: -x[1]['cost'])]
+
+        result = {
+            'generated': datetime.utcnow().isoformat() + 'Z',
+            'totals': {
+                'inputTokens': total_tokens['input'],
+                'outputTokens': total_tokens['output'],
+                'cacheReadTokens': total_tokens['cacheRead'],
+                'cacheWriteTokens': total_tokens['cacheWrite'],
+                'totalCost': round(total_cost, 4)
+            },
+            'byModel': models_list,
+            'byDay': days_list,
+            'recentCalls': recent_calls
+        }
+
+        output.write_json("usage.json", result, stamp="generated")
+
+        print(f"Usage extracted: ${total_cost:.4f} total, {total_tokens['input'] + total_tokens['output']} tokens")
@@ -4,19 +4,18 @@ Generate JSON data files for the Botch Dashboard
 Run periodically to update dashboard data
 """
 
-import json
 import os
 import glob
 from datetime import datetime
 from pathlib import Path
 
+import output
+import skills
+import store
+
 API_DIR = Path("/home/moltbot/clawd/dashboards/api")
 MEMORY_DIR = Path("/home/moltbot/clawd/memory")
 WORKSPACE = Path("/home/moltbot/clawd")
-SKILLS_DIRS = [
-    Path("/home/moltbot/clawd/skills"),
-    Path("/home/moltbot/.npm-global/lib/node_modules/openclaw/skills")
-]
 
 def ensure_dir():
     API_DIR.mkdir(parents=True, exist_ok=True)
@@ -27,150 +26,100 @@ def generate_meta():
         "generated": datetime.utcnow().isoformat() + "Z",
         "version": "1.0"
     }
-    with open(API_DIR / "meta.json", "w") as f:
-        json.dump(meta, f)
+    output.write_meta(meta)
 
 def generate_memory_files():
-    """Generate list of memory files with content preview"""
-    files = []
-    for filepath in sorted(MEMORY_DIR.glob("*.md"), reverse=True):
-        try:
-            stat = filepath.stat()
-            content = filepath.read_text(encoding='utf-8')
-            files.append({
-                "name": filepath.name,
-                "size": stat.st_size,
-                "modified": int(stat.st_mtime),
-                "preview": content[:2000] if len(content) > 2000 else content
-            })
-        except Exception as e:
-            print(f"Error reading {filepath}: {e}")
-    
-    with open(API_DIR / "memory-files.json", "w") as f:
-        json.dump(files, f, indent=2)
+    """Update the memory file index (previews, word counts, search) and list it
+
+    Only files changed since the last run are read; full contents are served
+    by server.js on demand.
+    """
+    conn = store.connect()
+    paths = sorted(MEMORY_DIR.glob("*.md")) + sorted(MEMORY_DIR.glob("*.json"))
+    store.index_memory_files(conn, paths)
+    conn.commit()
+    files = store.memory_files(conn)
+    conn.close()
+    output.write_json("memory-files.json", files)
 
 def generate_memory_main():
     """Generate MEMORY.md content"""
     memory_path = WORKSPACE / "MEMORY.md"
     if memory_path.exists():
         content = memory_path.read_text(encoding='utf-8')
-        with open(API_DIR / "memory-main.json", "w") as f:
-            json.dump(content, f)
-
-def parse_skill_md(filepath):
-    """Parse a SKILL.md file to extract metadata"""
-    try:
-        content = filepath.read_text(encoding='utf-8')
-        lines = content.split('\n')
-        
-        title = ""
-        description = ""
-        
-        for line in lines:
-            line = line.strip()
-            if line.startswith('# ') and not title:
-                title = line[2:].strip()
-            elif line.startswith('> ') and not description:
-                description = line[2:].strip()
-            elif description and line.startswith('>'):
-                # Continue multi-line description
-                description += " " + line[1:].strip()
-        
-        # If no description found, try to get first paragraph
-        if not description:
-            in_content = False
-            for line in lines:
-                if line.startswith('# '):
-                    in_content = True
-                    continue
-                if in_content and line.strip() and not line.startswith('#') and not line.startswith('---'):
-                    description = line.strip()
-                    break
-        
-        return title, description
-    except Exception as e:
-        print(f"Error parsing {filepath}: {e}")
-        return "", ""
+        output.write_json("memory-main.json", content)
 
 def generate_skills():
-    """Generate skills list from SKILL.md files"""
-    skills = {}
-    
-    for skills_dir in SKILLS_DIRS:
-        if not skills_dir.exists():
-            continue
-        
-        for skill_path in skills_dir.iterdir():
-            if not skill_path.is_dir():
-                continue
-            
-            skill_file = skill_path / "SKILL.md"
-            if not skill_file.exists():
-                continue
-            
-            name = skill_path.name
-            title, description = parse_skill_md(skill_file)
-            
-            # Don't overwrite if we already have a better version
-            if name in skills and skills[name].get('description'):
-                continue
-            
-            skills[name] = {
-                "name": name,
-                "title": title or name,
-                "description": description or "",
-                "path": str(skill_file)
-            }
-    
-    skills_list = sorted(skills.values(), key=lambda x: x['name'])
-    
-    with open(API_DIR / "skills.json", "w") as f:
-        json.dump(skills_list, f, indent=2)
+    """Generate skills list from SKILL.md files, with their status"""
+    skills.generate_skills()
+
+def human_bytes(n):
+    """Size in the style of `df -h` / `free -h`"""
+    value = float(n)
+    for unit in ('B', 'K', 'M', 'G', 'T'):
+        if value < 1024 or unit == 'T':
+            break
+        value /= 1024
+    return f"{value:.1f}{unit}" if value < 10 and unit != 'B' else f"{round(value)}{unit}"
+
+def format_uptime(seconds):
+    """Same wording as `uptime -p`"""
+    minutes = int(seconds // 60)
+    parts = []
+    for name, size in (('week', 10080), ('day', 1440), ('hour', 60), ('minute', 1)):
+        n, minutes = divmod(minutes, size)
+        if n:
+            parts.append(f"{n} {name}{'' if n == 1 else 's'}")
+    return "up " + (", ".join(parts) or "0 minutes")
 
 def generate_system_info():
-    """Generate system information"""
-    import subprocess
-    
+    """Generate system information from /proc and statvfs (no subprocesses)"""
     info = {}
     
     try:
-        # Uptime
-        uptime = subprocess.check_output(['uptime', '-p'], text=True).strip()
-        info['uptime'] = uptime
-    except:
+        with open('/proc/uptime') as f:
+            info['uptime'] = format_uptime(float(f.read().split()[0]))
+    except (OSError, ValueError, IndexError):
         info['uptime'] = 'unknown'
     
     try:
-        # Disk usage
-        df = subprocess.check_output(['df', '-h', '/home/moltbot'], text=True)
-        lines = df.strip().split('\n')
-        if len(lines) > 1:
-            parts = lines[1].split()
-            info['disk'] = {
-                'total': parts[1],
-                'used': parts[2],
-                'available': parts[3],
-                'percent': parts[4]
-            }
-    except:
+        # Disk usage, computed like df
+        st = os.statvfs('/home/moltbot')
+        total = st.f_blocks * st.f_frsize
+        used = total - st.f_bfree * st.f_frsize
+        available = st.f_bavail * st.f_frsize
+        info['disk'] = {
+            'total': human_bytes(total),
+            'used': human_bytes(used),
+            'available': human_bytes(available),
+            'percent': f"{-(-used * 100 // (used + available))}%"
+        }
+    except (OSError, ZeroDivisionError):
         pass
     
     try:
         # Memory
-        free = subprocess.check_output(['free', '-h'], text=True)
-        lines = free.strip().split('\n')
-        if len(lines) > 1:
-            parts = lines[1].split()
-            info['memory'] = {
-                'total': parts[1],
-                'used': parts[2],
-                'available': parts[6] if len(parts) > 6 else parts[3]
-            }
-    except:
+        kb = {}
+        with open('/proc/meminfo') as f:
+            for line in f:
+                key, _, value = line.partition(':')
+                kb[key] = int(value.split()[0])
+        total = kb['MemTotal'] * 1024
+        available = kb.get('MemAvailable', kb['MemFree']) * 1024
+        info['memory'] = {
+            'total': human_bytes(total),
+            'used': human_bytes(total - available),
+            'available': human_bytes(available)
+        }
+    except (OSError, ValueError, KeyError, IndexError):
+        pass
+    
+    try:
+        info['load'] = [round(l, 2) for l in os.getloadavg()]
+    except OSError:
         pass
     
-    with open(API_DIR / "system.json", "w") as f:
-        json.dump(info, f, indent=2)
+    output.write_json("system.json", info)
 
 def main():
     print(f"Generating dashboard data at {datetime.now()}")
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Atomic, change-detecting writer for the api/*.json outputs
+
+Outputs are serialized compactly and compared with the file already on
+disk; unchanged data is not rewritten, so its mtime (and the server's
+cached response) stays valid. Changed files are written to a temp file and
+moved into place, so readers never see a half-written file.
+
+The hash of every output is recorded in meta.json under "files", in the
+same form server.js uses for its ETags (sha1, base64url).
+"""
+
+import base64
+import hashlib
+import json
+import os
+from pathlib import Path
+
+API_DIR = Path("/home/moltbot/clawd/dashboards/api")
+META_FILE = "meta.json"
+
+def content_hash(data):
+    """sha1 of `data` (bytes) as unpadded base64url"""
+    return base64.urlsafe_b64encode(hashlib.sha1(data).digest()).rstrip(b'=').decode('ascii')
+
+def serialize(obj):
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+def replace_file(path, data):
+    """Write `data` to `path` through a temp file in the same directory"""
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+def file_entry(path, digest):
+    stat = path.stat()
+    return {'hash': digest, 'size': stat.st_size, 'modified': stat.st_mtime_ns // 1000000}
+
+def read_meta():
+    try:
+        with open(API_DIR / META_FILE) as f:
+            meta = json.load(f)
+        if isinstance(meta, dict):
+            return meta
+    except (OSError, ValueError):
+        pass
+    return {}
+
+def write_meta(meta):
+    """Write meta.json, keeping the recorded output hashes"""
+    API_DIR.mkdir(parents=True, exist_ok=True)
+    meta = {**meta, 'files': read_meta().get('files', {})}
+    replace_file(API_DIR / META_FILE, serialize(meta))
+
+def record(name, entry):
+    meta = read_meta()
+    files = meta.setdefault('files', {})
+    if files.get(name) == entry:
+        return
+    files[name] = entry
+    replace_file(API_DIR / META_FILE, serialize(meta))
+
+def write_json(name, obj, stamp=None):
+    """Write api/<name> if its content changed; returns True if it was written
+
+    `stamp` names a top-level key (e.g. a generation timestamp) that is not
+    compared: if nothing else changed, the file keeps its old stamp.
+    """
+    API_DIR.mkdir(parents=True, exist_ok=True)
+    path = API_DIR / name
+    try:
+        with open(path, 'rb') as f:
+            existing = f.read()
+    except OSError:
+        existing = None
+    data = serialize(obj)
+    if stamp and existing is not None and existing != data:
+        try:
+            old = json.loads(existing)
+            if isinstance(old, dict) and stamp in old:
+                restamped = serialize({**obj, stamp: old[stamp]})
+                if restamped == existing:
+                    data = restamped
+        except ValueError:
+            pass
+    unchanged = data == existing
+    digest = content_hash(data)
+    if not unchanged:
+        replace_file(path, data)
+    record(name, file_entry(path, digest))
+    return not unchanged
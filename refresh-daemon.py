@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""
+Resident refresh daemon for the dashboard data
+
+Watches the session transcripts, memory files, workspace config files and
+skill directories (inotify, or polling where inotify is unavailable) and
+re-runs only the generators whose inputs changed. Bursts of changes are
+debounced into one refresh. With --once it runs every generator a single
+time and exits, which is what update-all.sh does.
+
+Every refresh writes api/refresh-report.json: wall and CPU time and peak
+RSS per generator, plus the transcript scanner's counters (files, bytes,
+lines, malformed lines, records). server.js includes it in /api/metrics.
+"""
+
+import argparse
+import ctypes
+import ctypes.util
+import importlib.util
+import os
+import resource
+import select
+import struct
+import sys
+import time
+import traceback
+from datetime import datetime
+from pathlib import Path
+
+import output
+import skills
+import transcripts
+from extractors import ChatExtractor, LogsExtractor, UsageExtractor
+
+HERE = Path(__file__).resolve().parent
+
+DEBOUNCE_SECONDS = 2.0   # quiet period before a refresh
+MAX_DELAY_SECONDS = 15.0  # refresh at least this often while changes keep coming
+POLL_SECONDS = 5.0
+SYSTEM_SECONDS = 60.0
+REPORT_FILE = "refresh-report.json"
+
+def load_script(filename):
+    """Import one of the hyphen-named generator scripts as a module"""
+    name = filename[:-3].replace('-', '_')
+    spec = importlib.util.spec_from_file_location(name, HERE / filename)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def log(message):
+    print(f"[{datetime.now().isoformat(timespec='seconds')}] {message}", flush=True)
+
+class Generator:
+    """A refresh step and the paths (files or directories) it reads"""
+
+    def __init__(self, name, inputs, func):
+        self.name = name
+        self.inputs = [Path(p) for p in inputs]
+        self.func = func
+
+    def reads(self, path):
+        return any(path == p or p in path.parents for p in self.inputs)
+
+def build_generators(workers):
+    generate_data = load_script('generate-data.py')
+    extract_config = load_script('extract-config.py')
+
+    def extract_transcripts():
+        return transcripts.run([ChatExtractor(sessions=10, limit=30), LogsExtractor(), UsageExtractor()],
+                               workers=workers)
+
+    workspace = extract_config.WORKSPACE
+    return [
+        Generator('transcripts', [transcripts.SESSIONS_DIR], extract_transcripts),
+        Generator('memory', [generate_data.MEMORY_DIR], generate_data.generate_memory_files),
+        Generator('memory-main', [generate_data.WORKSPACE / 'MEMORY.md'], generate_data.generate_memory_main),
+        Generator('config', [workspace / f for f in extract_config.CONFIG_FILES], extract_config.main),
+        Generator('skills', skills.SKILLS_DIRS, skills.generate_skills),
+        Generator('system', [], generate_data.generate_system_info),
+    ], generate_data
+
+class Inotify:
+    """Minimal inotify binding (Linux) through ctypes"""
+
+    IN_MODIFY = 0x002
+    IN_ATTRIB = 0x004
+    IN_CLOSE_WRITE = 0x008
+    IN_MOVED_FROM = 0x040
+    IN_MOVED_TO = 0x080
+    IN_CREATE = 0x100
+    IN_DELETE = 0x200
+    IN_Q_OVERFLOW = 0x4000
+    IN_ISDIR = 0x40000000
+    MASK = IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+    EVENT = struct.Struct('iIII')
+
+    def __init__(self):
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or None, use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+        self.watches = {}
+
+    def watch(self, path):
+        wd = self._add_watch(self.fd, os.fsencode(path), self.MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err), str(path))
+        self.watches[wd] = Path(path)
+
+    def read(self, timeout):
+        """Changed paths within `timeout` seconds; None means events were lost"""
+        if not select.select([self.fd], [], [], timeout)[0]:
+            return []
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+        paths = []
+        pos = 0
+        while pos < len(data):
+            wd, mask, _, length = self.EVENT.unpack_from(data, pos)
+            pos += self.EVENT.size
+            name = data[pos:pos + length].rstrip(b'\0')
+            pos += length
+            if mask & self.IN_Q_OVERFLOW:
+                return None
+            directory = self.watches.get(wd)
+            if directory is not None:
+                path = directory / os.fsdecode(name) if name else directory
+                paths.append(path)
+                # Watch new skill directories so their SKILL.md is seen
+                if mask & self.IN_ISDIR and mask & (self.IN_CREATE | self.IN_MOVED_TO):
+                    try:
+                        self.watch(path)
+                    except OSError:
+                        pass
+        return paths
+
+class Poller:
+    """Fallback watcher comparing (mtime, size) snapshots of the watched directories"""
+
+    def __init__(self):
+        self.dirs = []
+        self.snapshot = {}
+        self.next_poll = time.monotonic() + POLL_SECONDS
+
+    def watch(self, path):
+        self.dirs.append(Path(path))
+        self.snapshot.update(self.scan(Path(path)))
+
+    @staticmethod
+    def scan(directory):
+        entries = {}
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    try:
+                        st = entry.stat()
+                        entries[Path(entry.path)] = (st.st_mtime_ns, st.st_size)
+                    except OSError:
+                        continue
+        except OSError:
+            pass
+        return entries
+
+    def read(self, timeout):
+        # Callers wake up every `timeout` to run their timers; the directories
+        # are only rescanned every POLL_SECONDS
+        wait = self.next_poll - time.monotonic()
+        if wait > timeout:
+            time.sleep(timeout)
+            return []
+        time.sleep(max(wait, 0))
+        self.next_poll = time.monotonic() + POLL_SECONDS
+        current = {}
+        for directory in self.dirs:
+            current.update(self.scan(directory))
+        changed = [p for p in current.keys() | self.snapshot.keys()
+                   if current.get(p) != self.snapshot.get(p)]
+        self.snapshot = current
+        return changed
+
+def watched_dirs(generators):
+    """Directories to watch: the input directories plus the parents of input files"""
+    dirs = set()
+    for gen in generators:
+        for path in gen.inputs:
+            dirs.add(path if path.is_dir() else path.parent)
+            # Skill directories hold one subdirectory per skill
+            if gen.name == 'skills' and path.is_dir():
+                dirs.update(p for p in path.iterdir() if p.is_dir())
+    return sorted(d for d in dirs if d.is_dir())
+
+def cpu_seconds():
+    """CPU time of this process and its finished children (scan workers)"""
+    own = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return own.ru_utime + own.ru_stime + children.ru_utime + children.ru_stime
+
+def status_kb(field):
+    """A /proc/self/status memory field (VmRSS, VmHWM) in KiB, None if unavailable"""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith(field + ':'):
+                    return int(line.split()[1])
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+def reset_peak_rss():
+    """Restart this process's peak RSS (VmHWM) from its current RSS; False if unsupported"""
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+def children_max_rss_kb():
+    """Largest peak RSS of any finished child (scan workers) so far"""
+    return resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+
+def run_stage(name, func):
+    """Run one refresh step; returns its timings and the counters it returned"""
+    stage = {'name': name, 'ok': True}
+    cpu = cpu_seconds()
+    peak_reset = reset_peak_rss()
+    children_peak = children_max_rss_kb()
+    start = time.monotonic()
+    try:
+        counters = func()
+        if isinstance(counters, dict):
+            stage.update(counters)
+    except Exception:
+        stage['ok'] = False
+        log(f"{name}: failed\n{traceback.format_exc()}")
+    stage['wallSeconds'] = round(time.monotonic() - start, 4)
+    stage['cpuSeconds'] = round(cpu_seconds() - cpu, 4)
+    # Peak RSS of this process during the stage. A worker's peak is only
+    # known when it exceeds every earlier child's (getrusage keeps the maximum)
+    stage['peakRssKb'] = status_kb('VmHWM') if peak_reset else None
+    stage['rssKb'] = status_kb('VmRSS')
+    workers_peak = children_max_rss_kb()
+    stage['workerPeakRssKb'] = workers_peak if workers_peak > children_peak else None
+    if stage['ok']:
+        log(f"{name}: refreshed in {stage['wallSeconds']:.2f}s")
+    return stage
+
+def refresh(generators, names, generate_data):
+    started = datetime.now()
+    start = time.monotonic()
+    stages = [run_stage(gen.name, gen.func) for gen in generators if gen.name in names]
+    stages.append(run_stage('meta', generate_data.generate_meta))
+    report = {
+        'started': started.isoformat(timespec='seconds'),
+        'wallSeconds': round(time.monotonic() - start, 4),
+        'ok': all(stage['ok'] for stage in stages),
+        'stages': stages
+    }
+    try:
+        output.write_json(REPORT_FILE, report)
+    except OSError as e:
+        log(f"Cannot write {REPORT_FILE}: {e}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Refresh dashboard data when its inputs change")
+    parser.add_argument('--once', action='store_true', help='refresh everything once and exit')
+    parser.add_argument('--poll', action='store_true', help='poll instead of using inotify')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='parse session files in N worker processes (default: 1)')
+    args = parser.parse_args()
+
+    generators, generate_data = build_generators(args.workers)
+    generate_data.ensure_dir()
+    all_names = {gen.name for gen in generators}
+
+    log("Full refresh")
+    refresh(generators, all_names, generate_data)
+    if args.once:
+        return
+
+    watcher = None
+    if not args.poll:
+        try:
+            watcher = Inotify()
+        except (OSError, AttributeError) as e:
+            log(f"inotify unavailable ({e}), polling every {POLL_SECONDS:.0f}s")
+    if watcher is None:
+        watcher = Poller()
+    directories = watched_dirs(generators)
+    for directory in directories:
+        try:
+            watcher.watch(directory)
+        except OSError as e:
+            log(f"Cannot watch {directory}: {e}")
+    log(f"Watching {len(directories)} directories")
+
+    pending = set()
+    first_change = last_change = None
+    next_system = time.monotonic() + SYSTEM_SECONDS
+    while True:
+        changed = watcher.read(DEBOUNCE_SECONDS / 2)
+        now = time.monotonic()
+        if changed is None:
+            changed = []
+            pending |= all_names
+            first_change = first_change or now
+            last_change = now
+        for path in changed:
+            for gen in generators:
+                if gen.reads(path):
+                    pending.add(gen.name)
+                    first_change = first_change or now
+                    last_change = now
+        if now >= next_system:
+            pending.add('system')
+            first_change = first_change or now
+            next_system = now + SYSTEM_SECONDS
+
+        if pending and (now - (last_change or 0) >= DEBOUNCE_SECONDS
+                        or now - first_change >= MAX_DELAY_SECONDS):
+            names, pending = pending, set()
+            first_change = last_change = None
+            refresh(generators, names, generate_data)
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        sys.exit(0)
@@ -8,11 +8,18 @@ const http = require('http');
 const fs = require('fs');
 const path = require('path');
 const crypto = require('crypto');
+const os = require('os');
+const zlib = require('zlib');
 const WebSocket = require('ws');
 
 const PORT = process.env.PORT || 3456;
 const GATEWAY_URL = process.env.GATEWAY_URL || 'ws://127.0.0.1:18789';
 const GATEWAY_TOKEN = process.env.GATEWAY_TOKEN || 'af08ac7542be48400e040054f2db2810a39f95f648418493';
+const API_CACHE_TTL_MS = parseInt(process.env.API_CACHE_TTL_MS, 10) || 5000;
+const WORKSPACE_DIR = '/home/moltbot/clawd';
+const MEMORY_DIR = path.join(WORKSPACE_DIR, 'memory');
+const CONFIG_FILES = ['AGENTS.md', 'SOUL.md', 'TOOLS.md', 'USER.md', 'IDENTITY.md', 'HEARTBEAT.md', 'MEMORY.md'];
+const API_DIR = path.join(__dirname, 'api');
 
 // Device identity (simple approach - generate once and store)
 const DEVICE_FILE = path.join(__dirname, '.device-identity.json');
@@ -83,6 +90,7 @@ function connectGateway() {
     connected = false;
     connectNonce = null;
     flushPending(new Error('Gateway disconnected'));
+    invalidateGatewayCache(Object.keys(GATEWAY_CACHE_TTL_MS));
     setTimeout(connectGateway, 3000);
   });
   
@@ -114,6 +122,7 @@ function sendConnect() {
   gatewayRequest('connect', connectMsg).then((res) => {
     console.log('[gateway] Connected successfully!');
     connected = true;
+    GATEWAY_RESOURCES.forEach(notifyChange);
   }).catch((err) => {
     console.error('[gateway] Connect failed:', err.message);
   });
@@ -127,6 +136,11 @@ function handleGatewayMessage(msg) {
     return;
   }
   
+  if (msg.type === 'event') {
+    onGatewayEvent(msg.event, msg.payload);
+    return;
+  }
+  
   if (msg.type === 'res') {
     const pending = pendingRequests.get(msg.id);
     if (pending) {
@@ -147,7 +161,142 @@ function flushPending(err) {
   pendingRequests.clear();
 }
 
+// Metrics (/api/metrics): latency histograms of HTTP routes, gateway methods
+// and store queries. Bin k counts durations of [2**(k-1), 2**k) ms, as in
+// store.py's usage histograms.
+const LATENCY_BINS = 24;
+
+class LatencyHistogram {
+  constructor() {
+    this.bins = new Array(LATENCY_BINS).fill(0);
+    this.count = 0;
+    this.sumMs = 0;
+    this.maxMs = 0;
+  }
+  
+  add(ms) {
+    const k = Math.min(32 - Math.clz32(Math.floor(ms)), LATENCY_BINS - 1);
+    this.bins[k]++;
+    this.count++;
+    this.sumMs += ms;
+    this.maxMs = Math.max(this.maxMs, ms);
+  }
+  
+  // Approximate q-quantile: the middle of the bin it falls in
+  percentile(q) {
+    let seen = 0;
+    for (let k = 0; k < LATENCY_BINS; k++) {
+      seen += this.bins[k];
+      if (this.count && seen >= q * this.count) return k > 1 ? (3 << k) >> 2 : k;
+    }
+    return null;
+  }
+  
+  toJSON() {
+    return {
+      count: this.count,
+      meanMs: this.count ? Math.round(this.sumMs / this.count * 100) / 100 : null,
+      maxMs: Math.round(this.maxMs * 100) / 100,
+      p50: this.percentile(0.5),
+      p90: this.percentile(0.9),
+      p99: this.percentile(0.99),
+      bins: this.bins
+    };
+  }
+}
+
+const routeLatency = new Map();    // route -> LatencyHistogram
+const gatewayLatency = new Map();  // gateway method -> LatencyHistogram
+const storeLatency = new Map();    // store op -> LatencyHistogram
+let httpInFlight = 0;
+
+function observe(histograms, key, startNs) {
+  if (!histograms.has(key)) histograms.set(key, new LatencyHistogram());
+  histograms.get(key).add(Number(process.hrtime.bigint() - startNs) / 1e6);
+}
+
+function hitRate(stats) {
+  const lookups = stats.hits + stats.misses;
+  return lookups ? stats.hits / lookups : 0;
+}
+
+// Read-only gateway methods and how long their results may be reused
+const GATEWAY_CACHE_TTL_MS = {
+  'cron.list': 5000,
+  'sessions.list': 3000,
+  'chat.history': 3000,
+  'skills.status': 30000
+};
+const GATEWAY_CACHE_MAX_ENTRIES = 200;
+const gatewayCache = new Map();        // key -> { expires, payload }, oldest use first
+const gatewayInFlight = new Map();     // key -> pending promise
+const gatewayGenerations = new Map();  // method -> invalidation count
+const gatewayStats = { sent: 0, cacheHits: 0, cacheMisses: 0, coalesced: 0, timeouts: 0 };
+
+// Cached/coalesced gateway request. Identical read requests in flight are
+// sent once; their results are reused until the TTL expires or a gateway
+// event invalidates the method. Other methods go straight to the gateway.
 function gatewayRequest(method, params = {}) {
+  const ttl = GATEWAY_CACHE_TTL_MS[method];
+  if (ttl === undefined) return sendGatewayRequest(method, params);
+  
+  const key = method + JSON.stringify(params);
+  const cached = gatewayCache.get(key);
+  if (cached && cached.expires > Date.now()) {
+    gatewayStats.cacheHits++;
+    gatewayCache.delete(key);
+    gatewayCache.set(key, cached);
+    return Promise.resolve(cached.payload);
+  }
+  if (gatewayInFlight.has(key)) {
+    gatewayStats.coalesced++;
+    return gatewayInFlight.get(key);
+  }
+  
+  gatewayStats.cacheMisses++;
+  const generation = gatewayGenerations.get(method) || 0;
+  const promise = sendGatewayRequest(method, params).then((payload) => {
+    // Don't cache a result that an event invalidated while it was in flight
+    if ((gatewayGenerations.get(method) || 0) === generation) {
+      gatewayCache.delete(key);
+      gatewayCache.set(key, { expires: Date.now() + ttl, payload });
+      if (gatewayCache.size > GATEWAY_CACHE_MAX_ENTRIES) {
+        gatewayCache.delete(gatewayCache.keys().next().value);
+      }
+    }
+    return payload;
+  }).finally(() => {
+    if (gatewayInFlight.get(key) === promise) gatewayInFlight.delete(key);
+  });
+  gatewayInFlight.set(key, promise);
+  return promise;
+}
+
+function invalidateGatewayCache(methods) {
+  for (const method of methods) {
+    gatewayGenerations.set(method, (gatewayGenerations.get(method) || 0) + 1);
+    const prefix = method + '{';
+    for (const key of gatewayCache.keys()) {
+      if (key.startsWith(prefix)) gatewayCache.delete(key);
+    }
+    for (const key of gatewayInFlight.keys()) {
+      if (key.startsWith(prefix)) gatewayInFlight.delete(key);
+    }
+  }
+}
+
+function gatewayCacheStats() {
+  const lookups = gatewayStats.cacheHits + gatewayStats.cacheMisses + gatewayStats.coalesced;
+  return {
+    ...gatewayStats,
+    hitRate: lookups ? (gatewayStats.cacheHits + gatewayStats.coalesced) / lookups : 0,
+    inFlight: gatewayInFlight.size,
+    pending: pendingRequests.size,
+    cached: gatewayCache.size
+  };
+}
+
+function sendGatewayRequest(method, params = {}) {
   return new Promise((resolve, reject) => {
     if (!gatewayWs || gatewayWs.readyState !== WebSocket.OPEN) {
       return reject(new Error('Gateway not connected'));
@@ -155,54 +304,247 @@ function gatewayRequest(method, params = {}) {
     
     const id = `req-${++requestId}`;
     const msg = { type: 'req', id, method, params };
+    const started = process.hrtime.bigint();
     
-    pendingRequests.set(id, { resolve, reject });
+    gatewayStats.sent++;
+    pendingRequests.set(id, {
+      resolve: (payload) => { observe(gatewayLatency, method, started); resolve(payload); },
+      reject: (err) => { observe(gatewayLatency, method, started); reject(err); }
+    });
     gatewayWs.send(JSON.stringify(msg));
     
     // Timeout
     setTimeout(() => {
       if (pendingRequests.has(id)) {
         pendingRequests.delete(id);
+        gatewayStats.timeouts++;
         reject(new Error('Request timeout'));
       }
     }, 30000);
   });
 }
 
+// Session store client: store.py serve answers one JSON query per line
+const { spawn } = require('child_process');
+const STORE_SCRIPT = path.join(__dirname, 'store.py');
+let storeProc = null;
+let storeBuffer = '';
+let storePending = new Map();
+let storeRequestId = 0;
+
+function startStore() {
+  storeProc = spawn('python3', [STORE_SCRIPT, 'serve'], { stdio: ['pipe', 'pipe', 'inherit'] });
+  storeBuffer = '';
+  
+  storeProc.stdout.on('data', (chunk) => {
+    storeBuffer += chunk.toString();
+    let newline;
+    while ((newline = storeBuffer.indexOf('\n')) >= 0) {
+      const line = storeBuffer.slice(0, newline);
+      storeBuffer = storeBuffer.slice(newline + 1);
+      try {
+        const msg = JSON.parse(line);
+        const pending = storePending.get(msg.id);
+        if (pending) {
+          storePending.delete(msg.id);
+          if (msg.ok) {
+            pending.resolve(msg.payload);
+          } else {
+            pending.reject(new Error(msg.error || 'Store query failed'));
+          }
+        }
+      } catch (e) {
+        console.error('[store] Parse error:', e.message);
+      }
+    }
+  });
+  
+  const onExit = (err) => {
+    if (err) console.error('[store] Helper failed:', err.message);
+    storeProc = null;
+    for (const [, p] of storePending) {
+      p.reject(new Error('Store helper exited'));
+    }
+    storePending.clear();
+  };
+  storeProc.on('error', onExit);
+  storeProc.on('exit', () => onExit());
+  storeProc.stdin.on('error', (err) => console.error('[store] Write failed:', err.message));
+}
+
+function storeQuery(op, params = {}) {
+  return new Promise((resolve, reject) => {
+    if (!storeProc) startStore();
+    
+    const id = ++storeRequestId;
+    const started = process.hrtime.bigint();
+    storePending.set(id, {
+      resolve: (payload) => { observe(storeLatency, op, started); resolve(payload); },
+      reject: (err) => { observe(storeLatency, op, started); reject(err); }
+    });
+    storeProc.stdin.write(JSON.stringify({ id, op, params }) + '\n');
+    
+    // Timeout
+    setTimeout(() => {
+      if (storePending.has(id)) {
+        storePending.delete(id);
+        reject(new Error('Store query timeout'));
+      }
+    }, 10000);
+  });
+}
+
+// Paging parameters from the query string (limit -1 = no limit)
+function pageParams(query, defaultLimit) {
+  const limit = parseInt(query.get('limit'), 10);
+  const offset = parseInt(query.get('offset'), 10);
+  return {
+    limit: Number.isFinite(limit) ? limit : defaultLimit,
+    offset: Number.isFinite(offset) && offset > 0 ? offset : 0
+  };
+}
+
+// System metrics: sampled in-process from /proc and statfs on a fixed
+// interval (no subprocesses); the last SYSTEM_HISTORY samples of each series
+// are kept as one byte per sample for the sparklines.
+const SYSTEM_SAMPLE_MS = 10000;
+const SYSTEM_HISTORY = 360;
+const SYSTEM_DISK_PATH = '/';
+
+class ByteRing {
+  constructor(size) {
+    this.data = new Uint8Array(size);
+    this.start = 0;
+    this.length = 0;
+  }
+  
+  push(value) {
+    const size = this.data.length;
+    this.data[(this.start + this.length) % size] = Math.max(0, Math.min(255, Math.round(value)));
+    if (this.length < size) this.length++;
+    else this.start = (this.start + 1) % size;
+  }
+  
+  // Samples oldest first
+  toBytes() {
+    const out = new Uint8Array(this.length);
+    for (let i = 0; i < this.length; i++) {
+      out[i] = this.data[(this.start + i) % this.data.length];
+    }
+    return out;
+  }
+}
+
+const systemHistory = {
+  memory: new ByteRing(SYSTEM_HISTORY), // % of RAM used
+  disk: new ByteRing(SYSTEM_HISTORY),   // % of disk used
+  load: new ByteRing(SYSTEM_HISTORY)    // 1-min load average, % of CPU count
+};
+let systemSample = null;
+
+// Human-readable sizes in the style of `df -h` / `free -h`
+function humanBytes(bytes) {
+  const units = ['B', 'K', 'M', 'G', 'T', 'P'];
+  let value = bytes;
+  let unit = 0;
+  while (value >= 1024 && unit < units.length - 1) {
+    value /= 1024;
+    unit++;
+  }
+  return (value < 10 && unit > 0 ? value.toFixed(1) : Math.round(value)) + units[unit];
+}
+
+// Same wording as `uptime -p`
+function formatUptime(seconds) {
+  const parts = [];
+  let minutes = Math.floor(seconds / 60);
+  for (const [name, size] of [['week', 10080], ['day', 1440], ['hour', 60], ['minute', 1]]) {
+    const n = Math.floor(minutes / size);
+    minutes -= n * size;
+    if (n > 0) parts.push(`${n} ${name}${n === 1 ? '' : 's'}`);
+  }
+  return 'up ' + (parts.join(', ') || '0 minutes');
+}
+
+async function sampleSystem() {
+  const sample = { time: Date.now() };
+  try {
+    const uptime = await fs.promises.readFile('/proc/uptime', 'utf8');
+    sample.uptimeSeconds = parseFloat(uptime);
+  } catch (e) {
+    sample.uptimeSeconds = os.uptime();
+  }
+  
+  try {
+    const meminfo = await fs.promises.readFile('/proc/meminfo', 'utf8');
+    const kb = {};
+    for (const match of meminfo.matchAll(/^(\w+):\s+(\d+) kB$/gm)) kb[match[1]] = parseInt(match[2], 10);
+    const total = kb.MemTotal * 1024;
+    const available = (kb.MemAvailable ?? kb.MemFree) * 1024;
+    sample.memory = { total, used: total - available, available };
+  } catch (e) {}
+  
+  try {
+    const st = await fs.promises.statfs(SYSTEM_DISK_PATH);
+    const total = st.blocks * st.bsize;
+    const available = st.bavail * st.bsize;
+    const used = total - st.bfree * st.bsize;
+    // Like df: percent of the space usable by non-root users
+    sample.disk = { total, used, available, percent: Math.ceil(used * 100 / (used + available)) };
+  } catch (e) {}
+  
+  sample.load = os.loadavg();
+  
+  systemSample = sample;
+  if (sample.memory) systemHistory.memory.push(sample.memory.used * 100 / sample.memory.total);
+  if (sample.disk) systemHistory.disk.push(sample.disk.percent);
+  systemHistory.load.push(sample.load[0] * 100 / (os.cpus().length || 1));
+}
+
+function startSystemSampler() {
+  sampleSystem();
+  setInterval(sampleSystem, SYSTEM_SAMPLE_MS);
+}
+
 // API handlers
 const apiHandlers = {
   'meta.json': async () => ({
     generatedAt: new Date().toISOString(),
     live: true,
-    gateway: connected ? 'connected' : 'disconnected'
+    gateway: connected ? 'connected' : 'disconnected',
+    gatewayCache: gatewayCacheStats()
   }),
   
   'system.json': async () => {
-    const { execSync } = require('child_process');
-    
-    // Get real system info
-    let uptime = 'unknown';
-    let disk = {};
-    let memory = {};
-    
-    try {
-      uptime = execSync('uptime -p', { encoding: 'utf8' }).trim();
-    } catch (e) {}
-    
-    try {
-      const dfOut = execSync('df -h / | tail -1', { encoding: 'utf8' }).trim().split(/\s+/);
-      disk = { total: dfOut[1], used: dfOut[2], available: dfOut[3], percent: dfOut[4] };
-    } catch (e) {}
-    
-    try {
-      const freeOut = execSync('free -h | grep Mem', { encoding: 'utf8' }).trim().split(/\s+/);
-      memory = { total: freeOut[1], used: freeOut[2], available: freeOut[6] };
-    } catch (e) {}
+    // Latest sample from the background sampler; nothing is run per request
+    if (!systemSample) await sampleSystem();
+    const { disk: d, memory: m } = systemSample;
+    const encode = (ring) => Buffer.from(ring.toBytes()).toString('base64');
     
-    return { uptime, disk, memory };
+    return {
+      uptime: formatUptime(systemSample.uptimeSeconds),
+      uptimeSeconds: Math.floor(systemSample.uptimeSeconds),
+      disk: d ? {
+        total: humanBytes(d.total), used: humanBytes(d.used), available: humanBytes(d.available),
+        percent: `${d.percent}%`, bytes: { total: d.total, used: d.used, available: d.available }
+      } : {},
+      memory: m ? {
+        total: humanBytes(m.total), used: humanBytes(m.used), available: humanBytes(m.available),
+        bytes: { total: m.total, used: m.used, available: m.available }
+      } : {},
+      load: systemSample.load.map(l => Math.round(l * 100) / 100),
+      sampledAt: new Date(systemSample.time).toISOString(),
+      // Sparklines: base64 of one byte (0-100 %) per sample, oldest first
+      history: {
+        intervalMs: SYSTEM_SAMPLE_MS,
+        memory: encode(systemHistory.memory),
+        disk: encode(systemHistory.disk),
+        load: encode(systemHistory.load)
+      }
+    };
   },
   
-  'cron.json': async () => {
+  'cron.json': async (query) => {
     const result = await gatewayRequest('cron.list', { includeDisabled: true });
     const jobs = result?.jobs || [];
     
@@ -238,7 +580,7 @@ const apiHandlers = {
     });
   },
   
-  'sessions.json': async () => {
+  'sessions.json': async (query) => {
     const result = await gatewayRequest('sessions.list', { 
       limit: 50,
       includeGlobal: true,
@@ -257,7 +599,7 @@ const apiHandlers = {
     }));
   },
   
-  'sessions-index.json': async () => {
+  'sessions-index.json': async (query) => {
     // Try live gateway first
     try {
       const result = await gatewayRequest('sessions.list', { 
@@ -282,17 +624,21 @@ const apiHandlers = {
       console.log('[api] Gateway sessions unavailable, using static data');
     }
     
-    // Fall back to static pre-generated index
-    const staticFile = path.join(__dirname, 'api', 'sessions-index.json');
+    // Fall back to the session store, then the static pre-generated index
+    try {
+      return await storeQuery('sessions', pageParams(query, -1));
+    } catch (e) {
+      console.log('[api] Session store unavailable:', e.message);
+    }
+    
     try {
-      const content = fs.readFileSync(staticFile, 'utf8');
-      return JSON.parse(content);
+      return await readApiFile('sessions-index.json');
     } catch (e) {
       return [];
     }
   },
   
-  'skills.json': async () => {
+  'skills.json': async (query) => {
     const result = await gatewayRequest('skills.status', {});
     const skills = result?.skills || [];
     return skills.map(s => ({
@@ -304,12 +650,31 @@ const apiHandlers = {
     }));
   },
   
-  'usage.json': async () => {
+  'usage.json': async (query) => {
+    // Any time window from the hourly rollups in the store:
+    // ?range=24h|7d|30d|all&granularity=hour|day[&model=&session=]
+    if (query.has('range') || query.has('granularity')) {
+      const params = {
+        range: query.get('range') || '7d',
+        granularity: query.get('granularity') || null,
+        model: query.get('model') || null,
+        session_id: query.get('session') || null
+      };
+      try {
+        return await storeQuery('usage', params);
+      } catch (e) {
+        console.log('[api] Usage rollups unavailable:', e.message);
+        return {
+          range: params.range, granularity: params.granularity || 'day', since: null,
+          totals: { inputTokens: 0, outputTokens: 0, cacheReadTokens: 0, cacheWriteTokens: 0, totalCost: 0, calls: 0 },
+          series: [], byModel: [], bySession: [], percentiles: {}
+        };
+      }
+    }
+    
     // Read from pre-generated usage file (updated by extract-usage.py)
-    const usageFile = path.join(__dirname, 'api', 'usage.json');
     try {
-      const content = fs.readFileSync(usageFile, 'utf8');
-      return JSON.parse(content);
+      return await readApiFile('usage.json');
     } catch (e) {
       // Return empty structure if file doesn't exist
       return {
@@ -321,9 +686,32 @@ const apiHandlers = {
     }
   },
   
+  'usage-calls': async (query) => {
+    // Aggregations over every archived call (store.py usage_calls):
+    // ?group=model|session|day|hour|call&range=24h|7d|30d|all[&model=&session=&top=]
+    const top = parseInt(query.get('top'), 10);
+    const params = {
+      range: query.get('range') || 'all',
+      group: query.get('group') || 'model',
+      model: query.get('model') || null,
+      session_id: query.get('session') || null,
+      top: top > 0 ? Math.min(top, 1000) : null
+    };
+    try {
+      return await storeQuery('usage_calls', params);
+    } catch (e) {
+      console.log('[api] Usage archive unavailable:', e.message);
+      return {
+        group: params.group, range: params.range, engine: null, archived: 0,
+        totals: { calls: 0, inputTokens: 0, outputTokens: 0, cacheReadTokens: 0, cacheWriteTokens: 0, tokens: 0, cost: 0 },
+        groups: []
+      };
+    }
+  },
+  
   'memory-main.json': async () => {
     try {
-      const content = fs.readFileSync('/home/moltbot/clawd/MEMORY.md', 'utf8');
+      const content = fs.readFileSync(path.join(WORKSPACE_DIR, 'MEMORY.md'), 'utf8');
       return content; // Return string directly
     } catch (e) {
       return '';
@@ -331,40 +719,19 @@ const apiHandlers = {
   },
   
   'memory-files.json': async () => {
-    const memDir = '/home/moltbot/clawd/memory';
     try {
-      const files = fs.readdirSync(memDir)
-        .filter(f => f.endsWith('.md') || f.endsWith('.json'))
-        .map(f => {
-          const filePath = path.join(memDir, f);
-          const stat = fs.statSync(filePath);
-          let preview = '';
-          try {
-            const content = fs.readFileSync(filePath, 'utf8');
-            preview = content.slice(0, 1000);
-          } catch (e) {}
-          return {
-            name: f,
-            size: stat.size,
-            modified: Math.floor(stat.mtime.getTime() / 1000),
-            preview
-          };
-        })
-        .sort((a, b) => b.modified - a.modified);
-      return files; // Return array directly
+      return await listMemoryFiles(); // Return array directly
     } catch (e) {
       return [];
     }
   },
   
   'config-files.json': async () => {
-    const configDir = '/home/moltbot/clawd';
-    const configFiles = ['AGENTS.md', 'SOUL.md', 'TOOLS.md', 'USER.md', 'IDENTITY.md', 'HEARTBEAT.md', 'MEMORY.md'];
     const result = {};
     
-    for (const f of configFiles) {
+    for (const f of CONFIG_FILES) {
       try {
-        const content = fs.readFileSync(path.join(configDir, f), 'utf8');
+        const content = fs.readFileSync(path.join(WORKSPACE_DIR, f), 'utf8');
         result[f] = content;
       } catch (e) {
         // File doesn't exist
@@ -373,10 +740,70 @@ const apiHandlers = {
     return result;
   },
   
-  'chat-history.json': async () => {
+  'search': async (query) => {
+    // Full-text search over session messages and memory files (store.py)
+    const q = (query.get('q') || '').trim();
+    const { limit, offset } = pageParams(query, 20);
+    if (!q) return { query: '', total: 0, limit, offset, results: [] };
+    const session = query.get('session');
+    return storeQuery('search', {
+      q,
+      kind: query.get('kind') || null,
+      session_id: session ? await storedSessionId(session) : null,
+      limit: Math.min(Math.max(limit, 1), 100),
+      offset,
+      before: query.get('before') || null,
+      order: query.get('order') === 'recent' ? 'recent' : 'rank',
+      full: query.get('full') === '1'
+    });
+  },
+  
+  'metrics': async () => {
+    // Server counters plus the last refresh-daemon.py run report
+    let pipeline = null;
+    try {
+      pipeline = JSON.parse((await readApiFile('refresh-report.json')).text);
+    } catch (e) {}
+    return {
+      generatedAt: new Date().toISOString(),
+      uptimeSeconds: Math.round(process.uptime()),
+      http: {
+        inFlight: httpInFlight,
+        streamClients: streamClients.size,
+        routes: Object.fromEntries(routeLatency)
+      },
+      gateway: {
+        connected,
+        pending: pendingRequests.size,
+        inFlight: gatewayInFlight.size,
+        sent: gatewayStats.sent,
+        timeouts: gatewayStats.timeouts,
+        methods: Object.fromEntries(gatewayLatency)
+      },
+      store: {
+        running: Boolean(storeProc),
+        pending: storePending.size,
+        queries: Object.fromEntries(storeLatency)
+      },
+      caches: {
+        api: { ...apiCacheStats, hitRate: hitRate(apiCacheStats), entries: apiCache.size },
+        static: { ...staticCacheStats, hitRate: hitRate(staticCacheStats), entries: staticCache.size, bytes: staticCacheBytes },
+        gateway: gatewayCacheStats()
+      },
+      pipeline
+    };
+  },
+  
+  'dashboard.json': async (query) => {
+    // All sections in one response; see dashboardBundle()
+    const names = query.get('sections') ? query.get('sections').split(',') : BUNDLE_SECTIONS;
+    return dashboardBundle(names.filter(n => BUNDLE_SECTIONS.includes(n)));
+  },
+  
+  'chat-history.json': async (query) => {
     try {
-      // Get main session first
-      const sessions = await gatewayRequest('sessions.list', { limit: 10 });
+      // Get main session first (same listing as sessions.json, so the gateway cache serves both)
+      const sessions = await gatewayRequest('sessions.list', { limit: 50, includeGlobal: true, includeUnknown: false });
       const mainSession = sessions?.sessions?.find(s => s.kind === 'main') || sessions?.sessions?.[0];
       const sessionKey = mainSession?.key || 'agent:main:main';
       
@@ -391,18 +818,64 @@ const apiHandlers = {
   }
 };
 
+// Session store id (transcript name) of a gateway session key; ids the
+// gateway does not list are returned as they are
+async function storedSessionId(sessionId) {
+  try {
+    // Same listing as sessions-index.json, so the gateway cache serves both
+    const result = await gatewayRequest('sessions.list', { limit: 100, includeGlobal: true, includeUnknown: true });
+    const entry = result?.sessions?.find(s => s.key === sessionId);
+    if (entry?.sessionId) return entry.sessionId;
+  } catch (e) {}
+  return sessionId;
+}
+
 // Session-specific handler
-async function getSession(sessionId) {
+// Transcripts (and so the session store) keep ISO timestamps; the gateway may
+// send epoch milliseconds instead
+function timestampCursor(ts) {
+  if (typeof ts === 'number') return Number.isFinite(ts) ? new Date(ts).toISOString() : null;
+  return ts || null;
+}
+
+async function getSession(sessionId, query) {
+  const page = pageParams(query, 200);
+  
+  // Older pages (?before=<timestamp>&limit=) only exist in the session store
+  const before = query.get('before');
+  if (before) {
+    try {
+      const session = await storeQuery('session', { session_id: await storedSessionId(sessionId), before, ...page });
+      if (session) return { ...session, id: sessionId };
+    } catch (e) {
+      console.log(`[api] Session store unavailable for ${sessionId}:`, e.message);
+    }
+    return { id: sessionId, before, hasMore: false, messages: [] };
+  }
+  
   // Try live gateway first
   try {
     const history = await gatewayRequest('chat.history', { 
       sessionKey: sessionId,
-      limit: 200 
+      limit: page.limit > 0 ? page.limit : 200
     });
     if (history?.messages && history.messages.length > 0) {
+      // Continue from the oldest gateway message; the store says if anything precedes it
+      const nextBefore = timestampCursor(history.messages[0].timestamp);
+      let hasMore = false;
+      if (nextBefore) {
+        try {
+          const older = await storeQuery('session', { session_id: await storedSessionId(sessionId), before: nextBefore, limit: 1 });
+          hasMore = Boolean(older?.messages?.length);
+        } catch (e) {
+          console.log(`[api] Session store unavailable for ${sessionId}:`, e.message);
+        }
+      }
       return {
         id: sessionId,
         key: sessionId,
+        hasMore,
+        nextBefore,
         messages: history.messages
       };
     }
@@ -410,14 +883,84 @@ async function getSession(sessionId) {
     console.log(`[api] Gateway session ${sessionId} unavailable:`, e.message);
   }
   
-  // Fall back to static pre-generated session file
-  const staticFile = path.join(__dirname, 'api', `session-${sessionId}.json`);
+  // Fall back to the session store (one page, counted back from the newest message)
   try {
-    const content = fs.readFileSync(staticFile, 'utf8');
-    return JSON.parse(content);
+    const session = await storeQuery('session', { session_id: await storedSessionId(sessionId), ...page });
+    if (session) return { ...session, id: sessionId };
   } catch (e) {
-    return { id: sessionId, messages: [] };
+    console.log(`[api] Session store unavailable for ${sessionId}:`, e.message);
   }
+  return { id: sessionId, messages: [] };
+}
+
+// Memory file index: name -> { size, mtimeMs, hash, words, preview }. Only files
+// whose size or mtime changed are read again; full contents are served on demand.
+const MEMORY_PREVIEW_CHARS = 1000;
+const memoryIndex = new Map();
+
+function isMemoryFile(name) {
+  return (name.endsWith('.md') || name.endsWith('.json')) && !name.startsWith('.') &&
+    name === path.basename(name);
+}
+
+function countWords(text) {
+  const words = text.match(/\S+/g);
+  return words ? words.length : 0;
+}
+
+function memoryEntry(stat, content) {
+  return {
+    size: stat.size,
+    mtimeMs: stat.mtimeMs,
+    hash: crypto.createHash('sha1').update(content).digest('base64url'),
+    words: countWords(content),
+    preview: content.slice(0, MEMORY_PREVIEW_CHARS)
+  };
+}
+
+async function listMemoryFiles() {
+  const names = (await fs.promises.readdir(MEMORY_DIR)).filter(isMemoryFile);
+  const present = new Set(names);
+  for (const name of memoryIndex.keys()) {
+    if (!present.has(name)) memoryIndex.delete(name);
+  }
+  await Promise.all(names.map(async (name) => {
+    const filePath = path.join(MEMORY_DIR, name);
+    try {
+      const stat = await fs.promises.stat(filePath);
+      const known = memoryIndex.get(name);
+      if (known && known.size === stat.size && known.mtimeMs === stat.mtimeMs) return;
+      memoryIndex.set(name, memoryEntry(stat, await fs.promises.readFile(filePath, 'utf8')));
+    } catch (e) {
+      memoryIndex.delete(name);
+    }
+  }));
+  return [...memoryIndex]
+    .map(([name, f]) => ({
+      name,
+      size: f.size,
+      modified: Math.floor(f.mtimeMs / 1000),
+      hash: f.hash,
+      words: f.words,
+      preview: f.preview
+    }))
+    .sort((a, b) => b.modified - a.modified);
+}
+
+// Full content of one memory file (/api/memory/<name>); undefined if there is none
+async function getMemoryFile(name) {
+  if (!isMemoryFile(name)) return undefined;
+  const filePath = path.join(MEMORY_DIR, name);
+  let stat, content;
+  try {
+    stat = await fs.promises.stat(filePath);
+    content = await fs.promises.readFile(filePath, 'utf8');
+  } catch (e) {
+    return undefined;
+  }
+  const entry = memoryEntry(stat, content);
+  memoryIndex.set(name, entry);
+  return { name, size: entry.size, modified: Math.floor(entry.mtimeMs / 1000), hash: entry.hash, words: entry.words, content };
 }
 
 // Helper functions
@@ -453,6 +996,369 @@ function getJobIcon(job) {
   return '⏰';
 }
 
+// API response cache: serialized body + ETag per URL, reused until the endpoint's TTL expires
+const apiCacheTtl = {
+  'metrics': 0,
+  'meta.json': 1000,
+  'dashboard.json': 1000,
+  'system.json': 2000,
+  'config-files.json': 15000,
+  'search': 15000
+};
+const apiCache = new Map();
+const apiCacheStats = { hits: 0, misses: 0 };
+const API_CACHE_MAX_ENTRIES = 500;
+const COMPRESS_MIN_BYTES = 1024;
+
+function computeApiResponse(apiPath, query) {
+  const sessionMatch = apiPath.match(/^session-(.+)\.json$/);
+  if (sessionMatch) return getSession(sessionMatch[1], query);
+  const memoryMatch = apiPath.match(/^memory\/([^/]+)$/);
+  if (memoryMatch) {
+    try {
+      return getMemoryFile(decodeURIComponent(memoryMatch[1]));
+    } catch (e) {
+      return null; // Malformed escape
+    }
+  }
+  if (apiHandlers[apiPath]) return apiHandlers[apiPath](query);
+  return null;
+}
+
+function cachedApiResponse(apiPath, url) {
+  const key = apiPath + url.search;
+  const now = Date.now();
+  const cached = apiCache.get(key);
+  if (cached && cached.expires > now) {
+    apiCacheStats.hits++;
+    return cached.promise;
+  }
+  apiCacheStats.misses++;
+  
+  const promise = (async () => {
+    const pending = computeApiResponse(apiPath, url.searchParams);
+    if (!pending) return null;
+    const data = await pending;
+    if (data === undefined) return null;
+    const body = Buffer.from(data instanceof RawJSON ? data.text : JSON.stringify(data));
+    const hash = (data instanceof RawJSON && data.hash) ||
+      crypto.createHash('sha1').update(body).digest('base64url');
+    // Weak ETag: the same hash is valid for every Content-Encoding of the body
+    const lastModified = data instanceof RawJSON && data.modified ? data.modified.toUTCString() : null;
+    return { body, etag: `W/"${hash}"`, lastModified, encoded: {} };
+  })();
+  
+  const entry = { promise, expires: now + (apiCacheTtl[apiPath] ?? API_CACHE_TTL_MS) };
+  apiCache.set(key, entry);
+  promise.then((result) => {
+    if (!result && apiCache.get(key) === entry) apiCache.delete(key);
+  }, () => {
+    if (apiCache.get(key) === entry) apiCache.delete(key);
+  });
+  
+  if (apiCache.size > API_CACHE_MAX_ENTRIES) {
+    for (const [k, e] of apiCache) {
+      if (e.expires <= now || apiCache.size > API_CACHE_MAX_ENTRIES) apiCache.delete(k);
+    }
+  }
+  return promise;
+}
+
+// Sections of /api/dashboard.json, in the order the client applies them
+const BUNDLE_SECTIONS = [
+  'memory-files', 'memory-main', 'skills', 'cron', 'sessions', 'chat-history',
+  'sessions-index', 'usage', 'config-files', 'system', 'meta'
+];
+
+// Runs the section handlers concurrently through the response cache and
+// splices their cached bodies into one document; failures are reported per
+// section instead of failing the whole bundle. Identical gateway calls made
+// by several sections are coalesced by gatewayRequest().
+async function dashboardBundle(names) {
+  const results = await Promise.allSettled(names.map(name =>
+    cachedApiResponse(`${name}.json`, new URL(`http://localhost/api/${name}.json`))
+  ));
+  
+  const sections = [];
+  const errors = {};
+  results.forEach((result, i) => {
+    if (result.status === 'fulfilled' && result.value) {
+      sections.push(`${JSON.stringify(names[i])}:${result.value.body.toString()}`);
+    } else {
+      errors[names[i]] = result.reason?.message || 'Not found';
+    }
+  });
+  return new RawJSON(`{"sections":{${sections.join(',')}},"errors":${JSON.stringify(errors)}}`);
+}
+
+// Pre-serialized JSON, passed through cachedApiResponse without re-encoding.
+// `hash` (sha1, base64url) of the text is used for the ETag when known.
+class RawJSON {
+  constructor(text, hash = null, modified = null) {
+    this.text = text;
+    this.hash = hash;
+    this.modified = modified;  // Date of the file it was read from
+  }
+}
+
+// Hashes output.py records in api/meta.json for every file it writes,
+// re-read whenever meta.json changes
+let apiFileHashes = { mtimeMs: -1, files: {} };
+
+async function recordedHash(name, stat) {
+  try {
+    const metaFile = path.join(API_DIR, 'meta.json');
+    const metaStat = await fs.promises.stat(metaFile);
+    if (metaStat.mtimeMs !== apiFileHashes.mtimeMs) {
+      const meta = JSON.parse(await fs.promises.readFile(metaFile, 'utf8'));
+      apiFileHashes = { mtimeMs: metaStat.mtimeMs, files: meta.files || {} };
+    }
+  } catch (e) {
+    return null;
+  }
+  // Only trust the hash if the file is still the one that was recorded
+  const entry = apiFileHashes.files[name];
+  if (entry && entry.size === stat.size && entry.modified === Math.floor(stat.mtimeMs)) {
+    return entry.hash;
+  }
+  return null;
+}
+
+// A pre-generated api/*.json file, served as is (no parse/re-serialize)
+async function readApiFile(name) {
+  const file = path.join(API_DIR, name);
+  const stat = await fs.promises.stat(file);
+  const text = await fs.promises.readFile(file, 'utf8');
+  const hash = await recordedHash(name, stat);
+  // Recorded files were written atomically; check anything else is valid JSON
+  if (!hash) JSON.parse(text);
+  return new RawJSON(text, hash, stat.mtime);
+}
+
+function etagMatches(header, etag) {
+  if (!header) return false;
+  const bare = (tag) => tag.trim().replace(/^W\//, '');
+  return header.split(',').some(tag => tag.trim() === '*' || bare(tag) === bare(etag));
+}
+
+// Preferred Content-Encoding from an Accept-Encoding header (br > gzip)
+function negotiateEncoding(header) {
+  if (!header) return null;
+  const accepted = new Set();
+  for (const part of header.split(',')) {
+    const [name, ...params] = part.trim().toLowerCase().split(';');
+    const q = params.map(p => p.trim()).find(p => p.startsWith('q='));
+    if (!q || parseFloat(q.slice(2)) > 0) accepted.add(name);
+  }
+  if (accepted.has('br')) return 'br';
+  if (accepted.has('gzip')) return 'gzip';
+  return null;
+}
+
+function compress(buffer, encoding, level = null) {
+  return new Promise((resolve, reject) => {
+    const done = (err, out) => (err ? reject(err) : resolve(out));
+    if (encoding === 'br') {
+      zlib.brotliCompress(buffer, { params: { [zlib.constants.BROTLI_PARAM_QUALITY]: level ?? 5 } }, done);
+    } else {
+      zlib.gzip(buffer, { level: level ?? zlib.constants.Z_DEFAULT_COMPRESSION }, done);
+    }
+  });
+}
+
+// Conditional GET: If-None-Match wins over If-Modified-Since
+function notModified(req, entry, etag = entry.etag) {
+  const inm = req.headers['if-none-match'];
+  if (inm) return etagMatches(inm, etag);
+  const ims = Date.parse(req.headers['if-modified-since'] || '');
+  return Boolean(entry.lastModified) && !isNaN(ims) && Date.parse(entry.lastModified) <= ims;
+}
+
+// ETag of one Content-Encoding of a body: strong ETags are per representation,
+// weak ones already stand for every encoding
+function representationEtag(etag, encoding) {
+  if (!encoding || etag.startsWith('W/')) return etag;
+  return `${etag.slice(0, -1)}-${encoding}"`;
+}
+
+// A Range is honoured unless If-Range names another version (weak ETags never match)
+function ifRangeMatches(header, entry) {
+  if (!header) return true;
+  if (header.startsWith('"')) return header === entry.etag;
+  if (header.startsWith('W/')) return false;
+  return header === entry.lastModified;
+}
+
+// Single byte range of a Range header: { start, end } (inclusive), 'invalid',
+// or null to send the whole body (no header, multiple ranges, other units)
+function parseRange(header, size) {
+  const match = /^bytes=(\d*)-(\d*)$/.exec((header || '').trim());
+  if (!match || (!match[1] && !match[2])) return null;
+  let start, end;
+  if (match[1]) {
+    start = parseInt(match[1], 10);
+    end = match[2] ? Math.min(parseInt(match[2], 10), size - 1) : size - 1;
+  } else {
+    start = Math.max(size - parseInt(match[2], 10), 0);
+    end = size - 1;
+  }
+  if (start > end || start >= size) return 'invalid';
+  return { start, end };
+}
+
+async function sendCached(req, res, entry, contentType) {
+  // Ranges address the uncompressed body, whose ETag is entry.etag
+  const range = req.headers.range && ifRangeMatches(req.headers['if-range'], entry)
+    ? parseRange(req.headers.range, entry.body.length) : null;
+  const compressible = !range && entry.compressible !== false && entry.body.length >= COMPRESS_MIN_BYTES;
+  const encoding = compressible ? negotiateEncoding(req.headers['accept-encoding']) : null;
+  const etag = representationEtag(entry.etag, encoding);
+  
+  res.setHeader('ETag', etag);
+  if (entry.lastModified) res.setHeader('Last-Modified', entry.lastModified);
+  res.setHeader('Cache-Control', 'no-cache');
+  res.setHeader('Vary', 'Accept-Encoding');
+  res.setHeader('Accept-Ranges', 'bytes');
+  
+  if (notModified(req, entry, etag)) {
+    res.writeHead(304);
+    res.end();
+    return;
+  }
+  
+  if (range === 'invalid') {
+    res.writeHead(416, { 'Content-Range': `bytes */${entry.body.length}` });
+    res.end();
+    return;
+  }
+  if (range) {
+    res.writeHead(206, {
+      'Content-Type': contentType,
+      'Content-Range': `bytes ${range.start}-${range.end}/${entry.body.length}`,
+      'Content-Length': range.end - range.start + 1
+    });
+    res.end(entry.body.subarray(range.start, range.end + 1));
+    return;
+  }
+  
+  let body = entry.body;
+  if (encoding) {
+    if (!entry.encoded[encoding]) entry.encoded[encoding] = compress(entry.body, encoding);
+    body = await entry.encoded[encoding];
+    res.setHeader('Content-Encoding', encoding);
+  }
+  
+  res.writeHead(200, { 'Content-Type': contentType, 'Content-Length': body.length });
+  res.end(body);
+}
+
+// Server-sent events: /api/stream pushes a resource to the clients whenever it changes
+const streamClients = new Set();
+const streamEtags = new Map();   // resource -> ETag last pushed
+const streamTimers = new Map();  // resource -> pending debounce timer
+const STREAM_DEBOUNCE_MS = 250;
+
+// Gateway-backed resources; gateway events -> resources they change and
+// gateway methods whose cached results they invalidate
+const GATEWAY_RESOURCES = ['cron', 'sessions', 'sessions-index', 'chat-history', 'skills'];
+const GATEWAY_EVENT_RESOURCES = [
+  [/^cron/, ['cron'], ['cron.list']],
+  [/^(session|chat|agent)/, ['sessions', 'sessions-index', 'chat-history'], ['sessions.list', 'chat.history']],
+  [/^skill/, ['skills'], ['skills.status']]
+];
+
+function invalidateApiCache(apiPath) {
+  for (const key of apiCache.keys()) {
+    if (key === apiPath || key.startsWith(apiPath + '?')) apiCache.delete(key);
+  }
+}
+
+// Streaming progress of a reply (chat deltas, agent text/tool streams) changes
+// nothing the dashboard shows until the final or lifecycle event that follows
+function isStreamingEvent(event, payload) {
+  if (event === 'chat') return payload?.state === 'delta';
+  if (event === 'agent') return payload?.stream !== undefined && payload.stream !== 'lifecycle';
+  return false;
+}
+
+function onGatewayEvent(event, payload) {
+  if (isStreamingEvent(event, payload)) return;
+  for (const [pattern, resources, methods] of GATEWAY_EVENT_RESOURCES) {
+    if (pattern.test(event || '')) {
+      invalidateGatewayCache(methods);
+      resources.forEach(notifyChange);
+    }
+  }
+}
+
+// Debounced: a burst of changes to one resource results in a single push
+function notifyChange(resource) {
+  if (streamTimers.has(resource)) return;
+  streamTimers.set(resource, setTimeout(() => {
+    streamTimers.delete(resource);
+    pushResource(resource);
+  }, STREAM_DEBOUNCE_MS));
+}
+
+async function pushResource(resource) {
+  const apiPath = `${resource}.json`;
+  invalidateApiCache(apiPath);
+  if (streamClients.size === 0) return;
+  
+  try {
+    const entry = await cachedApiResponse(apiPath, new URL(`http://localhost/api/${apiPath}`));
+    if (!entry || streamEtags.get(resource) === entry.etag) return;
+    streamEtags.set(resource, entry.etag);
+    // Every line of the body needs its own data: field (files may be pretty-printed)
+    const data = entry.body.toString().split(/\r\n|\r|\n/).map(line => `data: ${line}`).join('\n');
+    const frame = `event: ${resource}\n${data}\n\n`;
+    for (const client of streamClients) client.write(frame);
+  } catch (e) {
+    console.log(`[stream] ${resource} unavailable:`, e.message);
+  }
+}
+
+function openStream(req, res) {
+  res.writeHead(200, {
+    'Content-Type': 'text/event-stream',
+    'Cache-Control': 'no-cache',
+    'Connection': 'keep-alive',
+    'X-Accel-Buffering': 'no'
+  });
+  res.write('retry: 5000\n\n');
+  streamClients.add(res);
+  req.on('close', () => streamClients.delete(res));
+}
+
+function watchResource(target, resources, filter = null, onChange = null) {
+  try {
+    const watcher = fs.watch(target, (eventType, filename) => {
+      if (onChange && filename) onChange(filename);
+      if (!filter || (filename && filter(filename))) resources.forEach(notifyChange);
+    });
+    watcher.on('error', (e) => console.log(`[stream] Watch on ${target} failed:`, e.message));
+  } catch (e) {
+    console.log(`[stream] Cannot watch ${target}:`, e.message);
+  }
+}
+
+function startWatches() {
+  watchResource(MEMORY_DIR, ['memory-files'], null,
+    f => invalidateApiCache(`memory/${encodeURIComponent(f)}`));
+  watchResource(WORKSPACE_DIR, ['config-files'], f => CONFIG_FILES.includes(f));
+  watchResource(WORKSPACE_DIR, ['memory-main'], f => f === 'MEMORY.md');
+  watchResource(API_DIR, ['usage'], f => f === 'usage.json');
+  watchResource(API_DIR, ['sessions-index'], f => f === 'sessions-index.json');
+  
+  // Uptime and load change continuously: refresh them on a slow timer
+  setInterval(() => ['system', 'meta'].forEach(notifyChange), 30000);
+  
+  // Keep idle connections open through proxies and the SSH tunnel
+  setInterval(() => {
+    for (const client of streamClients) client.write(': ping\n\n');
+  }, 25000);
+}
+
 // MIME types
 const mimeTypes = {
   '.html': 'text/html',
@@ -464,6 +1370,149 @@ const mimeTypes = {
   '.ico': 'image/x-icon'
 };
 
+// Static files: kept in memory with their compressed variants (made on first
+// request for an encoding), dropped from the cache when fs.watch reports a
+// change in their directory
+const STATIC_CACHE_MAX_BYTES = 32 * 1024 * 1024;
+const STATIC_FILE_MAX_BYTES = 4 * 1024 * 1024;  // larger files are streamed from disk
+const COMPRESSIBLE_TYPES = new Set(['.html', '.js', '.css', '.json', '.svg']);
+const staticCache = new Map();     // file path -> promise of an entry
+const staticSizes = new Map();     // file path -> body size, once loaded
+const staticWatchers = new Map();  // directory -> fs.FSWatcher
+let staticCacheBytes = 0;
+const staticCacheStats = { hits: 0, misses: 0 };
+
+function dropStatic(filePath) {
+  staticCache.delete(filePath);
+  staticCacheBytes -= staticSizes.get(filePath) || 0;
+  staticSizes.delete(filePath);
+}
+
+// Watch a directory of cached files; false if it cannot be watched (then nothing in it is cached)
+function watchStaticDir(dir) {
+  if (staticWatchers.has(dir)) return true;
+  try {
+    const watcher = fs.watch(dir, (eventType, filename) => {
+      for (const filePath of staticCache.keys()) {
+        if (path.dirname(filePath) === dir && (!filename || path.basename(filePath) === filename)) {
+          dropStatic(filePath);
+        }
+      }
+    });
+    watcher.on('error', () => {
+      watcher.close();
+      staticWatchers.delete(dir);
+      for (const filePath of staticCache.keys()) {
+        if (path.dirname(filePath) === dir) dropStatic(filePath);
+      }
+    });
+    staticWatchers.set(dir, watcher);
+    return true;
+  } catch (e) {
+    return false;
+  }
+}
+
+async function loadStatic(filePath) {
+  const stat = await fs.promises.stat(filePath);
+  if (!stat.isFile()) return null;
+  const ext = path.extname(filePath);
+  const entry = {
+    lastModified: stat.mtime.toUTCString(),
+    contentType: mimeTypes[ext] || 'application/octet-stream',
+    compressible: COMPRESSIBLE_TYPES.has(ext)
+  };
+  if (stat.size > STATIC_FILE_MAX_BYTES) {
+    // Not cached: identified by size and mtime, like most servers do
+    return { ...entry, filePath, size: stat.size, etag: `"${stat.size.toString(16)}-${Math.floor(stat.mtimeMs).toString(16)}"` };
+  }
+  const body = await fs.promises.readFile(filePath);
+  return { ...entry, body, etag: `"${crypto.createHash('sha1').update(body).digest('base64url')}"`, encoded: {} };
+}
+
+// A file too large for the static cache, streamed from disk (compressed on
+// the fly at the default level, ranges only uncompressed)
+function sendStaticStream(req, res, entry) {
+  const range = req.headers.range && ifRangeMatches(req.headers['if-range'], entry)
+    ? parseRange(req.headers.range, entry.size) : null;
+  const encoding = !range && entry.compressible ? negotiateEncoding(req.headers['accept-encoding']) : null;
+  const etag = representationEtag(entry.etag, encoding);
+  
+  res.setHeader('ETag', etag);
+  res.setHeader('Last-Modified', entry.lastModified);
+  res.setHeader('Cache-Control', 'no-cache');
+  res.setHeader('Vary', 'Accept-Encoding');
+  res.setHeader('Accept-Ranges', 'bytes');
+  
+  if (notModified(req, entry, etag)) {
+    res.writeHead(304);
+    res.end();
+    return;
+  }
+  if (range === 'invalid') {
+    res.writeHead(416, { 'Content-Range': `bytes */${entry.size}` });
+    res.end();
+    return;
+  }
+  
+  let stream = fs.createReadStream(entry.filePath, range ? { start: range.start, end: range.end } : {});
+  if (range) {
+    res.writeHead(206, {
+      'Content-Type': entry.contentType,
+      'Content-Range': `bytes ${range.start}-${range.end}/${entry.size}`,
+      'Content-Length': range.end - range.start + 1
+    });
+  } else if (encoding) {
+    res.writeHead(200, { 'Content-Type': entry.contentType, 'Content-Encoding': encoding });
+    stream = stream.pipe(encoding === 'br' ? zlib.createBrotliCompress({
+      params: { [zlib.constants.BROTLI_PARAM_QUALITY]: 5 }
+    }) : zlib.createGzip());
+  } else {
+    res.writeHead(200, { 'Content-Type': entry.contentType, 'Content-Length': entry.size });
+  }
+  stream.on('error', () => res.destroy());
+  stream.pipe(res);
+}
+
+function cachedStatic(filePath) {
+  const cached = staticCache.get(filePath);
+  if (cached) {
+    staticCacheStats.hits++;
+    return cached;
+  }
+  staticCacheStats.misses++;
+  
+  const promise = loadStatic(filePath);
+  if (!watchStaticDir(path.dirname(filePath))) return promise;
+  staticCache.set(filePath, promise);
+  promise.then((entry) => {
+    if (staticCache.get(filePath) !== promise) return;
+    if (!entry || !entry.body) {
+      staticCache.delete(filePath);
+      return;
+    }
+    staticSizes.set(filePath, entry.body.length);
+    staticCacheBytes += entry.body.length;
+    // Evict the oldest files once over budget
+    for (const key of staticCache.keys()) {
+      if (staticCacheBytes <= STATIC_CACHE_MAX_BYTES || key === filePath) break;
+      dropStatic(key);
+    }
+  }, () => {
+    if (staticCache.get(filePath) === promise) staticCache.delete(filePath);
+  });
+  return promise;
+}
+
+// Route label for the metrics: fixed names, so the set of histograms stays bounded
+function routeName(pathname) {
+  if (!pathname.startsWith('/api/')) return 'static';
+  const apiPath = pathname.slice(5);
+  if (/^session-.+\.json$/.test(apiPath)) return 'session-:id.json';
+  if (apiPath.startsWith('memory/')) return 'memory/:name';
+  return Object.hasOwn(apiHandlers, apiPath) ? apiPath : 'other';
+}
+
 // HTTP server
 const server = http.createServer(async (req, res) => {
   const url = new URL(req.url, `http://${req.headers.host}`);
@@ -480,31 +1529,35 @@ const server = http.createServer(async (req, res) => {
     return;
   }
   
+  if (pathname === '/api/stream') {
+    openStream(req, res);
+    return;
+  }
+  
+  // Latency per route, from request to the end of the response
+  const started = process.hrtime.bigint();
+  const route = routeName(pathname);
+  httpInFlight++;
+  res.on('close', () => {
+    httpInFlight--;
+    observe(routeLatency, route, started);
+  });
+  
   // API routes
   if (pathname.startsWith('/api/')) {
     const apiPath = pathname.slice(5);
     
-    res.setHeader('Content-Type', 'application/json');
-    
     try {
-      let data;
-      
-      const sessionMatch = apiPath.match(/^session-(.+)\.json$/);
-      if (sessionMatch) {
-        data = await getSession(sessionMatch[1]);
-      } else if (apiHandlers[apiPath]) {
-        data = await apiHandlers[apiPath]();
-      } else {
-        res.writeHead(404);
+      const entry = await cachedApiResponse(apiPath, url);
+      if (!entry) {
+        res.writeHead(404, { 'Content-Type': 'application/json' });
         res.end(JSON.stringify({ error: 'Not found' }));
         return;
       }
-      
-      res.writeHead(200);
-      res.end(JSON.stringify(data, null, 2));
+      await sendCached(req, res, entry, 'application/json');
     } catch (e) {
       console.error(`[api] Error handling ${apiPath}:`, e.message);
-      res.writeHead(500);
+      res.writeHead(500, { 'Content-Type': 'application/json' });
       res.end(JSON.stringify({ error: e.message }));
     }
     return;
@@ -514,24 +1567,22 @@ const server = http.createServer(async (req, res) => {
   let filePath = pathname === '/' ? '/index.html' : pathname;
   filePath = path.join(__dirname, filePath);
   
-  if (!filePath.startsWith(__dirname)) {
+  // Dot paths hold private state: .cache (session store), .git, .device-identity.json
+  const relative = path.relative(__dirname, filePath);
+  if (relative.startsWith('..') || relative.split(path.sep).some(part => part.startsWith('.'))) {
     res.writeHead(403);
     res.end('Forbidden');
     return;
   }
   
   try {
-    const stat = fs.statSync(filePath);
-    if (stat.isDirectory()) {
-      filePath = path.join(filePath, 'index.html');
+    let entry = await cachedStatic(filePath);
+    if (!entry) {
+      // Directories serve their index.html
+      entry = await cachedStatic(path.join(filePath, 'index.html'));
     }
-    
-    const ext = path.extname(filePath);
-    const contentType = mimeTypes[ext] || 'application/octet-stream';
-    const content = fs.readFileSync(filePath);
-    
-    res.writeHead(200, { 'Content-Type': contentType });
-    res.end(content);
+    if (entry.body) await sendCached(req, res, entry, entry.contentType);
+    else sendStaticStream(req, res, entry);
   } catch (e) {
     res.writeHead(404);
     res.end('Not found');
@@ -541,6 +1592,8 @@ const server = http.createServer(async (req, res) => {
 // Start
 console.log('[server] Starting Botch Dashboard...');
 connectGateway();
+startSystemSampler();
+startWatches();
 server.listen(PORT, '127.0.0.1', () => {
   console.log(`[server] Botch Dashboard running at http://127.0.0.1:${PORT}`);
 });
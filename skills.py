@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Skill discovery and status checks -> skills.json
+
+Skills are the subdirectories of SKILLS_DIRS that hold a SKILL.md. The
+metadata parsed from each SKILL.md is cached by its mtime and size, so
+unchanged files are not read again. Whether a skill's commands are
+installed is resolved against an index of PATH that lists every PATH
+directory once per run, instead of a shutil.which() scan per command.
+"""
+
+import json
+import os
+from pathlib import Path
+
+import output
+
+CACHE_DIR = Path("/home/moltbot/clawd/dashboards/.cache")
+CACHE_FILE = CACHE_DIR / "skills-cache.json"
+CACHE_VERSION = 1
+SKILLS_DIRS = [
+    Path("/home/moltbot/clawd/skills"),
+    Path("/home/moltbot/.npm-global/lib/node_modules/openclaw/skills")
+]
+
+# Map skill names to their required commands/checks
+SKILL_CHECKS = {
+    '1password': ['op'],
+    'docker': ['docker'],
+    'github': ['gh'],
+    'gog': ['gog'],
+    'weather': [],  # No deps, always available
+    'tmux': ['tmux'],
+    'qmd': ['qmd'],
+}
+
+def parse_skill_md(filepath):
+    """Parse a SKILL.md file to extract metadata"""
+    try:
+        content = filepath.read_text(encoding='utf-8')
+        lines = content.split('\n')
+
+        title = ""
+        description = ""
+
+        for line in lines:
+            line = line.strip()
+            if line.startswith('# ') and not title:
+                title = line[2:].strip()
+            elif line.startswith('> ') and not description:
+                description = line[2:].strip()
+            elif description and line.startswith('>'):
+                # Continue multi-line description
+                description += " " + line[1:].strip()
+
+        # If no description found, try to get first paragraph
+        if not description:
+            in_content = False
+            for line in lines:
+                if line.startswith('# '):
+                    in_content = True
+                    continue
+                if in_content and line.strip() and not line.startswith('#') and not line.startswith('---'):
+                    description = line.strip()
+                    break
+
+        return title, description
+    except Exception as e:
+        print(f"Error parsing {filepath}: {e}")
+        return "", ""
+
+def is_executable(path):
+    return os.access(path, os.X_OK) and not os.path.isdir(path)
+
+class PathIndex:
+    """The names on PATH, listed once; which() answers like shutil.which()"""
+
+    def __init__(self, path=None):
+        if path is None:
+            path = os.environ.get('PATH', os.defpath)
+        self.candidates = {}  # name -> paths in PATH order
+        self.resolved = {}
+        seen = set()
+        for directory in path.split(os.pathsep):
+            directory = directory or os.curdir
+            if directory in seen:
+                continue
+            seen.add(directory)
+            try:
+                with os.scandir(directory) as it:
+                    for entry in it:
+                        self.candidates.setdefault(entry.name, []).append(entry.path)
+            except OSError:
+                continue
+
+    def which(self, cmd):
+        if os.path.dirname(cmd):
+            return cmd if is_executable(cmd) else None
+        if cmd not in self.resolved:
+            # Only the names asked for are checked for the executable bit
+            self.resolved[cmd] = next((p for p in self.candidates.get(cmd, ()) if is_executable(p)), None)
+        return self.resolved[cmd]
+
+def check_skill(name, index):
+    """Status of a skill, plus the commands it is missing"""
+    if name in SKILL_CHECKS:
+        missing = [cmd for cmd in SKILL_CHECKS[name] if index.which(cmd) is None]
+        if missing:
+            return {'status': 'inactive', 'missing': missing}
+        return {'status': 'active'}
+    # Default: check if a command with the skill name exists
+    return {'status': 'active' if index.which(name) else 'unknown'}
+
+def load_cache():
+    try:
+        with open(CACHE_FILE) as f:
+            cache = json.load(f)
+        if cache.get('version') == CACHE_VERSION:
+            return cache['files']
+    except (OSError, ValueError, AttributeError, KeyError):
+        pass
+    return {}
+
+def save_cache(files):
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    output.replace_file(CACHE_FILE, output.serialize({'version': CACHE_VERSION, 'files': files}))
+
+def discover_skills(cache):
+    """Skills found in SKILLS_DIRS and the cache entries of their SKILL.md files"""
+    skills = {}
+    files = {}
+    for skills_dir in SKILLS_DIRS:
+        try:
+            entries = sorted(os.scandir(skills_dir), key=lambda e: e.name)
+        except OSError:
+            continue
+
+        for entry in entries:
+            if not entry.is_dir():
+                continue
+            skill_file = Path(entry.path) / "SKILL.md"
+            try:
+                stat = skill_file.stat()
+            except OSError:
+                continue
+
+            key = str(skill_file)
+            meta = cache.get(key)
+            if meta is None or (meta['mtime'], meta['size']) != (stat.st_mtime_ns, stat.st_size):
+                title, description = parse_skill_md(skill_file)
+                meta = {'mtime': stat.st_mtime_ns, 'size': stat.st_size,
+                        'title': title, 'description': description}
+            files[key] = meta
+
+            # Don't overwrite if we already have a better version
+            name = entry.name
+            if name in skills and skills[name].get('description'):
+                continue
+
+            skills[name] = {
+                "name": name,
+                "title": meta['title'] or name,
+                "description": meta['description'] or "",
+                "path": key
+            }
+
+    return sorted(skills.values(), key=lambda x: x['name']), files
+
+def generate_skills():
+    """Discover the skills, check their commands and write skills.json once"""
+    cache = load_cache()
+    skills, files = discover_skills(cache)
+    if files != cache:
+        save_cache(files)
+
+    index = PathIndex()
+    for skill in skills:
+        skill.update(check_skill(skill['name'], index))
+
+    output.write_json("skills.json", skills)
+
+    active = sum(1 for s in skills if s.get('status') == 'active')
+    print(f"Skills checked: {active} active, {len(skills) - active} inactive/unknown")
@@ -0,0 +1,580 @@
+#!/usr/bin/env python3
+"""
+SQLite store for session logs and the full-text search index
+
+extract-transcripts.py upserts sessions and their messages incrementally;
+server.js queries the store through `store.py serve`, a resident helper that
+answers one JSON request per line on stdin with one JSON response on stdout.
+"""
+
+import html
+import json
+import re
+import sqlite3
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import usage_archive
+from output import content_hash
+
+CACHE_DIR = Path("/home/moltbot/clawd/dashboards/.cache")
+DB_PATH = CACHE_DIR / "dashboard.db"
+
+# Each entry upgrades the schema by one version (PRAGMA user_version)
+MIGRATIONS = ["""
+CREATE TABLE IF NOT EXISTS sessions (
+    id TEXT PRIMARY KEY,
+    file TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    modified REAL NOT NULL,
+    first_message TEXT,
+    last_message TEXT,
+    message_count INTEGER NOT NULL DEFAULT 0,
+    inode INTEGER,
+    offset INTEGER,
+    head_len INTEGER,
+    head TEXT
+);
+CREATE TABLE IF NOT EXISTS messages (
+    id INTEGER PRIMARY KEY,
+    session_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    timestamp TEXT,
+    role TEXT,
+    text TEXT,
+    UNIQUE (session_id, seq)
+);
+CREATE INDEX IF NOT EXISTS messages_by_time ON messages (session_id, timestamp);
+CREATE INDEX IF NOT EXISTS sessions_by_modified ON sessions (modified);
+""", """
+CREATE VIRTUAL TABLE messages_fts USING fts5(text, content='messages', content_rowid='id');
+CREATE TRIGGER messages_ai AFTER INSERT ON messages BEGIN
+    INSERT INTO messages_fts (rowid, text) VALUES (new.id, new.text);
+END;
+CREATE TRIGGER messages_ad AFTER DELETE ON messages BEGIN
+    INSERT INTO messages_fts (messages_fts, rowid, text) VALUES ('delete', old.id, old.text);
+END;
+INSERT INTO messages_fts (messages_fts) VALUES ('rebuild');
+
+CREATE TABLE memory_files (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    size INTEGER NOT NULL,
+    modified REAL NOT NULL,
+    content TEXT NOT NULL
+);
+CREATE VIRTUAL TABLE memory_fts USING fts5(name, content, content='memory_files', content_rowid='id');
+CREATE TRIGGER memory_files_ai AFTER INSERT ON memory_files BEGIN
+    INSERT INTO memory_fts (rowid, name, content) VALUES (new.id, new.name, new.content);
+END;
+CREATE TRIGGER memory_files_ad AFTER DELETE ON memory_files BEGIN
+    INSERT INTO memory_fts (memory_fts, rowid, name, content) VALUES ('delete', old.id, old.name, old.content);
+END;
+CREATE TRIGGER memory_files_au AFTER UPDATE ON memory_files BEGIN
+    INSERT INTO memory_fts (memory_fts, rowid, name, content) VALUES ('delete', old.id, old.name, old.content);
+    INSERT INTO memory_fts (rowid, name, content) VALUES (new.id, new.name, new.content);
+END;
+""", """
+CREATE TABLE usage_rollups (
+    session_id TEXT NOT NULL,
+    hour TEXT NOT NULL,
+    model TEXT NOT NULL,
+    input INTEGER NOT NULL,
+    output INTEGER NOT NULL,
+    cache_read INTEGER NOT NULL,
+    cache_write INTEGER NOT NULL,
+    cost REAL NOT NULL,
+    calls INTEGER NOT NULL,
+    token_hist TEXT NOT NULL,
+    latency_hist TEXT NOT NULL,
+    PRIMARY KEY (session_id, hour, model)
+) WITHOUT ROWID;
+CREATE INDEX usage_by_hour ON usage_rollups (hour);
+""", """
+ALTER TABLE memory_files ADD COLUMN hash TEXT;
+ALTER TABLE memory_files ADD COLUMN words INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE memory_files ADD COLUMN preview TEXT NOT NULL DEFAULT '';
+DROP TRIGGER memory_files_au;
+CREATE TRIGGER memory_files_au AFTER UPDATE OF name, content ON memory_files BEGIN
+    INSERT INTO memory_fts (memory_fts, rowid, name, content) VALUES ('delete', old.id, old.name, old.content);
+    INSERT INTO memory_fts (rowid, name, content) VALUES (new.id, new.name, new.content);
+END;
+-- Re-read every file once to fill in the new columns
+UPDATE memory_files SET modified = -1;
+"""]
+
+SNIPPET_TOKENS = 16
+MEMORY_PREVIEW_CHARS = 1000
+HIST_BINS = 40  # log2 buckets: bin k counts values in [2**(k-1), 2**k)
+RANGE_UNITS = {'h': 3600, 'd': 86400, 'w': 7 * 86400}
+
+def connect(readonly=False):
+    """Open the store; the writer creates it and its schema on first use"""
+    if readonly:
+        conn = sqlite3.connect(f"file:{DB_PATH}?mode=ro", uri=True)
+    else:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(DB_PATH)
+        conn.execute("PRAGMA journal_mode=WAL")
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        for version, script in enumerate(MIGRATIONS[version:], version + 1):
+            conn.executescript(script)
+            conn.execute(f"PRAGMA user_version = {version}")
+    conn.row_factory = sqlite3.Row
+    return conn
+
+_writer = None
+
+def writer():
+    """The process-wide writer connection
+
+    Consumers sharing a transcript pass write through the same connection,
+    so one's open transaction cannot lock the other out. Commit, don't close.
+    """
+    global _writer
+    if _writer is None:
+        _writer = connect()
+    return _writer
+
+def checkpoints(conn):
+    """Stored parse position and message bounds of every session, by id"""
+    result = {}
+    for row in conn.execute("SELECT * FROM sessions"):
+        result[row['id']] = {
+            'inode': row['inode'],
+            'size': row['size'],
+            'mtime': row['modified'],
+            'offset': row['offset'],
+            'headLen': row['head_len'],
+            'head': row['head'],
+            'firstMessage': row['first_message'],
+            'lastMessage': row['last_message'],
+            'messageCount': row['message_count']
+        }
+    return result
+
+def save_session(conn, session, messages, rebuild):
+    """Upsert a session row and append its new messages
+
+    With `rebuild` the session's stored messages are replaced, otherwise
+    `messages` continue the existing sequence.
+    """
+    if rebuild:
+        conn.execute("DELETE FROM messages WHERE session_id = ?", (session['id'],))
+        base = 0
+    else:
+        row = conn.execute("SELECT COALESCE(MAX(seq) + 1, 0) FROM messages WHERE session_id = ?",
+                           (session['id'],)).fetchone()
+        base = row[0]
+    conn.executemany(
+        "INSERT INTO messages (session_id, seq, timestamp, role, text) VALUES (?, ?, ?, ?, ?)",
+        ((session['id'], base + i, m['timestamp'], m['role'], m['text']) for i, m in enumerate(messages))
+    )
+    conn.execute("""
+        INSERT INTO sessions (id, file, size, modified, first_message, last_message,
+                              message_count, inode, offset, head_len, head)
+        VALUES (:id, :file, :size, :modified, :firstMessage, :lastMessage,
+                :messageCount, :inode, :offset, :headLen, :head)
+        ON CONFLICT (id) DO UPDATE SET
+            file = excluded.file, size = excluded.size, modified = excluded.modified,
+            first_message = excluded.first_message, last_message = excluded.last_message,
+            message_count = excluded.message_count, inode = excluded.inode,
+            offset = excluded.offset, head_len = excluded.head_len, head = excluded.head
+    """, session)
+
+def delete_sessions(conn, ids):
+    """Drop sessions whose transcript no longer exists"""
+    for session_id in ids:
+        conn.execute("DELETE FROM messages WHERE session_id = ?", (session_id,))
+        conn.execute("DELETE FROM sessions WHERE id = ?", (session_id,))
+
+def histogram():
+    return [0] * HIST_BINS
+
+def hist_add(hist, value):
+    hist[min(int(value).bit_length(), HIST_BINS - 1)] += 1
+
+def hist_merge(into, hist):
+    for i, count in enumerate(hist):
+        into[i] += count
+
+def hist_percentile(hist, q):
+    """Approximate q-quantile of a histogram: the middle of the bin it falls in"""
+    total = sum(hist)
+    if not total:
+        return None
+    seen = 0
+    for k, count in enumerate(hist):
+        seen += count
+        if seen >= q * total:
+            return (3 << k) // 4 if k > 1 else k
+    return None
+
+def encode_hist(hist):
+    """Compact JSON form of a histogram, without trailing empty bins"""
+    end = len(hist)
+    while end and not hist[end - 1]:
+        end -= 1
+    return json.dumps(hist[:end], separators=(',', ':'))
+
+def decode_hist(text):
+    hist = histogram()
+    for i, count in enumerate(json.loads(text)):
+        hist[i] = count
+    return hist
+
+def save_usage(conn, session_id, buckets, rebuild):
+    """Add a session's new usage to its hourly rollups
+
+    `buckets` maps (hour, model) to [input, output, cacheRead, cacheWrite,
+    cost, calls, token histogram, latency histogram]. With `rebuild` the
+    session's stored rollups are replaced.
+    """
+    if rebuild:
+        conn.execute("DELETE FROM usage_rollups WHERE session_id = ?", (session_id,))
+    for (hour, model), delta in buckets.items():
+        row = conn.execute("SELECT * FROM usage_rollups WHERE session_id = ? AND hour = ? AND model = ?",
+                           (session_id, hour, model)).fetchone()
+        values = list(delta)
+        if row is not None:
+            for i, column in enumerate(('input', 'output', 'cache_read', 'cache_write', 'cost', 'calls')):
+                values[i] += row[column]
+            values[6] = list(values[6])
+            values[7] = list(values[7])
+            hist_merge(values[6], decode_hist(row['token_hist']))
+            hist_merge(values[7], decode_hist(row['latency_hist']))
+        conn.execute("""
+            INSERT OR REPLACE INTO usage_rollups (session_id, hour, model, input, output, cache_read,
+                                                  cache_write, cost, calls, token_hist, latency_hist)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, (session_id, hour, model, *values[:6], encode_hist(values[6]), encode_hist(values[7])))
+
+def delete_usage(conn, ids):
+    """Drop the usage rollups of sessions whose transcript no longer exists"""
+    for session_id in ids:
+        conn.execute("DELETE FROM usage_rollups WHERE session_id = ?", (session_id,))
+
+def has_usage(conn):
+    return conn.execute("SELECT EXISTS (SELECT 1 FROM usage_rollups)").fetchone()[0] == 1
+
+def summary(row):
+    return {
+        'id': row['id'],
+        'file': row['file'],
+        'size': row['size'],
+        'modified': row['modified'],
+        'firstMessage': row['first_message'],
+        'lastMessage': row['last_message'],
+        'messageCount': row['message_count']
+    }
+
+def list_sessions(conn, limit=-1, offset=0):
+    """Session summaries, most recently modified first"""
+    rows = conn.execute("SELECT * FROM sessions ORDER BY modified DESC, id LIMIT ? OFFSET ?",
+                        (limit, offset))
+    return [summary(row) for row in rows]
+
+def get_session(conn, session_id, limit=200, offset=0, before=None):
+    """A session summary with one page of its messages
+
+    Pages count back from the newest message: offset 0 holds the latest
+    `limit` messages. With `before` (a timestamp cursor) the page holds the
+    latest messages older than it instead. Messages sharing the oldest
+    timestamp of a page all go on that page, so following `nextBefore`
+    never skips any. Messages within a page are in chronological order.
+    """
+    row = conn.execute("SELECT * FROM sessions WHERE id = ?", (session_id,)).fetchone()
+    if row is None:
+        return None
+    # One row more than asked for tells whether there are older messages
+    fetch = limit + 1 if limit >= 0 else -1
+    if before is None:
+        rows = conn.execute("""
+            SELECT seq, timestamp, role, text FROM messages WHERE session_id = ?
+            ORDER BY timestamp DESC, seq DESC LIMIT ? OFFSET ?
+        """, (session_id, fetch, offset)).fetchall()
+    else:
+        rows = conn.execute("""
+            SELECT seq, timestamp, role, text FROM messages WHERE session_id = ? AND timestamp < ?
+            ORDER BY timestamp DESC, seq DESC LIMIT ?
+        """, (session_id, before, fetch)).fetchall()
+    has_more = 0 < limit < len(rows)
+    if has_more:
+        rows = rows[:limit]
+    # Offset pages stay exactly `limit` long; cursor pages take the ties along
+    if has_more and (before is not None or offset == 0):
+        oldest = rows[-1]
+        rows += conn.execute("""
+            SELECT seq, timestamp, role, text FROM messages
+            WHERE session_id = ? AND timestamp = ? AND seq < ?
+            ORDER BY seq DESC
+        """, (session_id, oldest['timestamp'], oldest['seq'])).fetchall()
+        has_more = conn.execute("SELECT EXISTS (SELECT 1 FROM messages WHERE session_id = ? AND timestamp < ?)",
+                                (session_id, oldest['timestamp'])).fetchone()[0] == 1
+    return {
+        **summary(row),
+        'limit': limit,
+        'offset': offset,
+        'before': before,
+        'hasMore': has_more,
+        'nextBefore': rows[-1]['timestamp'] if rows else before,
+        'messages': [{'role': r['role'], 'text': r['text'], 'timestamp': r['timestamp']}
+                     for r in reversed(rows)]
+    }
+
+def index_memory_files(conn, paths):
+    """Bring the memory file index in line with `paths`, re-reading changed files only
+
+    Files whose size and mtime match the index are not opened. A file that
+    was only touched (same content hash) just gets its new stat recorded,
+    which leaves its full-text entry alone.
+    """
+    known = {row['name']: (row['size'], row['modified'], row['hash'])
+             for row in conn.execute("SELECT name, size, modified, hash FROM memory_files")}
+    seen = set()
+    for path in paths:
+        try:
+            stat = path.stat()
+            seen.add(path.name)
+            entry = known.get(path.name)
+            if entry and entry[:2] == (stat.st_size, stat.st_mtime):
+                continue
+            content = path.read_text(encoding='utf-8')
+        except Exception as e:
+            print(f"Error reading {path}: {e}")
+            continue
+        digest = content_hash(content.encode('utf-8'))
+        if entry and entry[2] == digest:
+            conn.execute("UPDATE memory_files SET size = ?, modified = ? WHERE name = ?",
+                         (stat.st_size, stat.st_mtime, path.name))
+            continue
+        conn.execute("""
+            INSERT INTO memory_files (name, size, modified, content, hash, words, preview)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (name) DO UPDATE SET
+                size = excluded.size, modified = excluded.modified, content = excluded.content,
+                hash = excluded.hash, words = excluded.words, preview = excluded.preview
+        """, (path.name, stat.st_size, stat.st_mtime, content, digest, len(content.split()),
+              content[:MEMORY_PREVIEW_CHARS]))
+    for name in set(known) - seen:
+        conn.execute("DELETE FROM memory_files WHERE name = ?", (name,))
+
+def memory_files(conn):
+    """The indexed memory files, newest first, with previews instead of content"""
+    rows = conn.execute("""
+        SELECT name, size, modified, hash, words, preview FROM memory_files
+        ORDER BY modified DESC, name
+    """)
+    return [{'name': r['name'], 'size': r['size'], 'modified': int(r['modified']), 'hash': r['hash'],
+             'words': r['words'], 'preview': r['preview']} for r in rows]
+
+def match_expression(q):
+    """FTS5 query matching all words of `q`, the last one as a prefix"""
+    words = re.findall(r'\w+', q)
+    if not words:
+        return None
+    terms = ['"%s"' % w for w in words]
+    terms[-1] += '*'
+    return ' '.join(terms)
+
+def highlight(snippet):
+    """HTML-escape a snippet and turn the match markers into <mark> tags"""
+    return html.escape(snippet).replace('\x02', '<mark>').replace('\x03', '</mark>')
+
+def search(conn, q, kind=None, session_id=None, limit=20, offset=0, before=None, order='rank', full=False):
+    """Ranked full-text hits over session messages and memory files
+
+    `kind` restricts the hits to 'message' or 'memory', `session_id` to the
+    messages of one session and `before` to messages older than a timestamp.
+    `order='recent'` sorts the hits newest first instead of by rank; `full`
+    adds the whole message text. Snippets are HTML with the matches in <mark>.
+    """
+    expr = match_expression(q)
+    result = {'query': q, 'total': 0, 'limit': limit, 'offset': offset, 'results': []}
+    if expr is None:
+        return result
+
+    parts = []
+    params = []
+    if kind in (None, 'message'):
+        where = "messages_fts MATCH ?"
+        params.append(expr)
+        if session_id:
+            where += " AND m.session_id = ?"
+            params.append(session_id)
+        if before:
+            where += " AND m.timestamp < ?"
+            params.append(before)
+        parts.append(f"""
+            SELECT 'message' AS kind, m.session_id AS ref, m.seq AS seq, m.timestamp AS timestamp,
+                   m.role AS role, snippet(messages_fts, 0, char(2), char(3), '…', {SNIPPET_TOKENS}) AS snippet,
+                   bm25(messages_fts) AS rank, m.text AS text
+            FROM messages_fts JOIN messages m ON m.id = messages_fts.rowid
+            WHERE {where}
+        """)
+    if kind in (None, 'memory') and not session_id and not before:
+        params.append(expr)
+        parts.append(f"""
+            SELECT 'memory' AS kind, f.name AS ref, NULL AS seq, f.modified AS timestamp,
+                   NULL AS role, snippet(memory_fts, 1, char(2), char(3), '…', {SNIPPET_TOKENS}) AS snippet,
+                   bm25(memory_fts) AS rank, NULL AS text
+            FROM memory_fts JOIN memory_files f ON f.id = memory_fts.rowid
+            WHERE memory_fts MATCH ?
+        """)
+    if not parts:
+        return result
+
+    union = " UNION ALL ".join(parts)
+    result['total'] = conn.execute(f"SELECT COUNT(*) FROM ({union})", params).fetchone()[0]
+    sort = "timestamp DESC, seq DESC" if order == 'recent' else "rank"
+    rows = conn.execute(f"{union} ORDER BY {sort} LIMIT ? OFFSET ?", params + [limit, offset])
+    for row in rows:
+        hit = {'kind': row['kind'], 'snippet': highlight(row['snippet']), 'score': -row['rank']}
+        if row['kind'] == 'message':
+            hit.update(session=row['ref'], seq=row['seq'], role=row['role'], timestamp=row['timestamp'])
+            if full:
+                hit['text'] = row['text']
+        else:
+            hit.update(file=row['ref'], modified=row['timestamp'])
+        result['results'].append(hit)
+    return result
+
+def parse_range(value):
+    """'24h', '7d', '2w' -> seconds; None for 'all' or an unknown range"""
+    match = re.fullmatch(r'(\d+)([hdw])', value or '')
+    if not match:
+        return None
+    return int(match.group(1)) * RANGE_UNITS[match.group(2)]
+
+def percentiles(hist):
+    return {f"p{q}": hist_percentile(hist, q / 100) for q in (50, 90, 99)}
+
+def usage(conn, range='7d', granularity=None, model=None, session_id=None, top=10):
+    """Usage over a time window from the hourly rollups, without re-scanning transcripts
+
+    `range` is '<n>h', '<n>d', '<n>w' or 'all'; `granularity` ('hour' or
+    'day') defaults to hours for windows up to two days. Returns totals,
+    a time series, per-model and top-`top` per-session breakdowns and
+    approximate token-size and latency percentiles.
+    """
+    span = parse_range(range)
+    if granularity not in ('hour', 'day'):
+        granularity = 'hour' if span and span <= 2 * 86400 else 'day'
+    key_len = 13 if granularity == 'hour' else 10
+
+    where = []
+    params = []
+    since = None
+    if span:
+        since = (datetime.utcnow() - timedelta(seconds=span)).strftime('%Y-%m-%dT%H')
+        where.append("hour >= ?")
+        params.append(since)
+    if model:
+        where.append("model = ?")
+        params.append(model)
+    if session_id:
+        where.append("session_id = ?")
+        params.append(session_id)
+    sql = "SELECT * FROM usage_rollups" + (" WHERE " + " AND ".join(where) if where else "")
+
+    totals = {'inputTokens': 0, 'outputTokens': 0, 'cacheReadTokens': 0, 'cacheWriteTokens': 0,
+              'totalCost': 0.0, 'calls': 0}
+    token_hist = histogram()
+    latency_hist = histogram()
+    series = {}
+    by_model = {}
+    by_session = {}
+    for row in conn.execute(sql, params):
+        tokens = row['input'] + row['output']
+        totals['inputTokens'] += row['input']
+        totals['outputTokens'] += row['output']
+        totals['cacheReadTokens'] += row['cache_read']
+        totals['cacheWriteTokens'] += row['cache_write']
+        totals['totalCost'] += row['cost']
+        totals['calls'] += row['calls']
+        row_tokens = decode_hist(row['token_hist'])
+        row_latency = decode_hist(row['latency_hist'])
+        hist_merge(token_hist, row_tokens)
+        hist_merge(latency_hist, row_latency)
+
+        bucket = series.setdefault(row['hour'][:key_len], {'tokens': 0, 'cost': 0.0, 'calls': 0})
+        entry = by_model.setdefault(row['model'], {'tokens': 0, 'cost': 0.0, 'calls': 0,
+                                                   'tokenHist': histogram(), 'latencyHist': histogram()})
+        hist_merge(entry['tokenHist'], row_tokens)
+        hist_merge(entry['latencyHist'], row_latency)
+        session = by_session.setdefault(row['session_id'], {'tokens': 0, 'cost': 0.0, 'calls': 0})
+        for target in (bucket, entry, session):
+            target['tokens'] += tokens
+            target['cost'] += row['cost']
+            target['calls'] += row['calls']
+
+    totals['totalCost'] = round(totals['totalCost'], 4)
+    models = []
+    for name, entry in sorted(by_model.items(), key=lambda x: -x[1]['cost']):
+        models.append({
+            'model': name,
+            'tokens': entry['tokens'],
+            'cost': entry['cost'],
+            'calls': entry['calls'],
+            'tokenPercentiles': percentiles(entry.pop('tokenHist')),
+            'latencyMsPercentiles': percentiles(entry.pop('latencyHist'))
+        })
+    sessions = sorted(by_session.items(), key=lambda x: -x[1]['cost'])[:top]
+    return {
+        'range': range if span else 'all',
+        'granularity': granularity,
+        'since': since,
+        'totals': totals,
+        'series': [{'bucket': k, **v} for k, v in sorted(series.items())],
+        'byModel': models,
+        'bySession': [{'session': k, **v} for k, v in sessions],
+        'percentiles': {'tokens': percentiles(token_hist), 'latencyMs': percentiles(latency_hist)}
+    }
+
+def usage_calls(conn, range='all', group='model', model=None, session_id=None, top=None):
+    """Per-call aggregations over the columnar usage archive (see usage_archive.query)"""
+    span = parse_range(range)
+    since = None
+    if span:
+        since = int((datetime.utcnow() - timedelta(seconds=span)).replace(tzinfo=timezone.utc).timestamp() * 1000)
+    result = usage_archive.query(group, since=since, model=model, session_id=session_id, top=top)
+    result['range'] = range if span else 'all'
+    return result
+
+# Ops that only read the usage archive and are answered without the database
+ARCHIVE_QUERIES = {'usage_calls'}
+
+QUERIES = {
+    'sessions': list_sessions,
+    'session': get_session,
+    'search': search,
+    'usage': usage,
+    'usage_calls': usage_calls,
+}
+
+def serve():
+    """Answer JSON-lines queries from server.js until stdin closes"""
+    conn = None
+    for line in sys.stdin:
+        req = {}
+        try:
+            req = json.loads(line)
+            if conn is None and req['op'] not in ARCHIVE_QUERIES:
+                conn = connect(readonly=True)
+            payload = QUERIES[req['op']](conn, **req.get('params', {}))
+            res = {'id': req.get('id'), 'ok': True, 'payload': payload}
+        except sqlite3.Error as e:
+            res = {'id': req.get('id'), 'ok': False, 'error': str(e)}
+            # Reopen on the next query, e.g. once the store has been created
+            conn = None
+        except Exception as e:
+            res = {'id': req.get('id'), 'ok': False, 'error': str(e)}
+        sys.stdout.write(json.dumps(res, ensure_ascii=False) + '\n')
+        sys.stdout.flush()
+
+if __name__ == "__main__":
+    if sys.argv[1:] == ['serve']:
+        serve()
+    else:
+        print("Usage: store.py serve")
@@ -20,10 +20,15 @@ const API_TESTS = [
   { endpoint: '/api/sessions-index.json', expectType: 'array', requiresGateway: true },
   { endpoint: '/api/skills.json', expectType: 'array', minLength: 1, requiresGateway: true },
   { endpoint: '/api/usage.json', expectType: 'object' },
+  { endpoint: '/api/usage.json?range=7d', expectType: 'object', required: ['range', 'granularity', 'totals', 'series'] },
+  { endpoint: '/api/usage-calls?group=day&range=30d', expectType: 'object', required: ['group', 'totals', 'groups'] },
   { endpoint: '/api/memory-main.json', expectType: 'string' },
   { endpoint: '/api/memory-files.json', expectType: 'array' },
   { endpoint: '/api/config-files.json', expectType: 'object' },
   { endpoint: '/api/chat-history.json', expectType: 'object' },
+  { endpoint: '/api/search', expectType: 'object', required: ['query', 'total', 'results'] },
+  { endpoint: '/api/dashboard.json', expectType: 'object', required: ['sections', 'errors'] },
+  { endpoint: '/api/metrics', expectType: 'object', required: ['http', 'gateway', 'store', 'caches'] },
 ];
 
 // UI Pages to test
@@ -0,0 +1,388 @@
+#!/usr/bin/env python3
+"""
+Shared single-pass reader for OpenClaw session transcripts
+
+Every session file is opened and parsed once per run; the decoded records
+are handed to each consumer (chat, logs, usage, ...) that asked for the file.
+A consumer only sees records at or after the byte offset it requested, so
+incremental consumers can share a pass with full-rebuild ones.
+
+Files are independent, so with `workers > 1` they are scanned in a process
+pool. Partial results are merged in file order, which keeps the output
+identical to a serial run.
+
+Lines are decoded with orjson when it is installed. Lines that cannot be a
+session or message record are skipped before decoding, and consumers can
+name byte strings (`needles`) a line must contain to be worth decoding;
+when every consumer of a file has needles, other message lines are only
+scanned for their timestamp. Consumers without needles (the logs) see every
+line decoded, so the combined pass of extract-transcripts.py and the
+refresh daemon does not skip any.
+
+Files are memory-mapped and sliced at line boundaries; pages already read
+are released as the scan moves on, so memory use does not grow with the
+size of a transcript.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+SESSIONS_DIR = Path("/home/moltbot/.openclaw/agents/main/sessions")
+HEAD_BYTES = 256  # fingerprint of the file start, used to detect rotation
+TIMESTAMP_RE = re.compile(rb'"timestamp"\s*:\s*"([^"\\]*)"')
+RELEASE_BYTES = 16 * 1024 * 1024  # drop mapped pages behind the scan in steps of this size
+
+def message_text(content):
+    """Flatten the text parts of a message's content into one string"""
+    text_parts = []
+    for part in content:
+        if isinstance(part, dict):
+            if part.get('type') == 'text':
+                text_parts.append(part.get('text', ''))
+        elif isinstance(part, str):
+            text_parts.append(part)
+    return '\n'.join(text_parts).strip()
+
+class Session:
+    """The `session` header record of a transcript"""
+    __slots__ = ('offset', 'data')
+
+    def __init__(self, offset, data):
+        self.offset = offset
+        self.data = data
+
+class Message:
+    """A `message` record; `text` is flattened on first access"""
+    __slots__ = ('offset', 'timestamp', 'role', 'model', 'usage', 'content', '_text')
+
+    def __init__(self, offset, data):
+        msg = data.get('message', {})
+        self.offset = offset
+        self.timestamp = data.get('timestamp', '')
+        self.role = msg.get('role', 'unknown')
+        self.model = msg.get('model', 'unknown')
+        self.usage = msg.get('usage', {})
+        self.content = msg.get('content', [])
+        self._text = None
+
+    @property
+    def text(self):
+        if self._text is None:
+            self._text = message_text(self.content)
+        return self._text
+
+class Stub:
+    """A message line that was not decoded: only its timestamp is known"""
+    __slots__ = ('offset', 'timestamp')
+
+    def __init__(self, offset, timestamp):
+        self.offset = offset
+        self.timestamp = timestamp
+
+def loads(raw):
+    """Decode JSON with orjson if available; what it rejects (NaN, huge ints) gets the stdlib"""
+    if orjson is not None:
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(raw)
+
+def dumps(obj):
+    """Compact JSON as bytes, with orjson if available"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+def decode_record(raw, offset, stats=None):
+    """Decode one transcript line into a Session/Message, or None
+
+    Lines that fail to decode are counted in stats['malformed'].
+    """
+    # Other record types (model_change, custom, ...) are not decoded at all
+    if b'"message"' not in raw and b'"session"' not in raw:
+        return None
+    try:
+        data = loads(raw)
+    except ValueError:
+        data = None
+    if not isinstance(data, dict):
+        if stats is not None:
+            stats['malformed'] += 1
+        return None
+    kind = data.get('type')
+    if kind == 'message':
+        return Message(offset, data)
+    if kind == 'session':
+        return Session(offset, data)
+    return None
+
+def stub_record(raw, offset):
+    """A Stub for a message line, read without decoding it, or None"""
+    if b'"message"' not in raw:
+        return None
+    # The top-level timestamp is the first string-valued one in the line
+    match = TIMESTAMP_RE.search(raw)
+    return Stub(offset, match.group(1).decode('utf-8', 'replace') if match else '')
+
+class RecordReader:
+    """Iterate the records of one transcript from byte offset `start`
+
+    Only complete lines are read: a trailing line without its newline is
+    still being written and is left for the next run. Lines that are not
+    valid JSON are skipped. `offset` is the end of the last line consumed.
+    With `needles`, lines containing none of them yield a Stub instead of
+    being decoded. `stats` counts the lines read, malformed lines and the
+    records yielded.
+    """
+
+    def __init__(self, filepath, start=0, needles=None):
+        self.filepath = filepath
+        self.offset = start
+        self.needles = needles
+        self.stats = {'lines': 0, 'malformed': 0, 'records': 0}
+
+    def __iter__(self):
+        with open(self.filepath, 'rb') as f:
+            try:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                return  # empty file
+        with mm:
+            if hasattr(mmap, 'MADV_SEQUENTIAL'):
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+            released = self.offset - self.offset % mmap.PAGESIZE
+            while True:
+                end = mm.find(b'\n', self.offset)
+                if end < 0:
+                    break
+                raw = mm[self.offset:end + 1]
+                line_offset = self.offset
+                self.offset = end + 1
+                self.stats['lines'] += 1
+                if self.needles is not None and not any(n in raw for n in self.needles):
+                    record = stub_record(raw, line_offset)
+                else:
+                    record = decode_record(raw, line_offset, self.stats)
+                if record is not None:
+                    self.stats['records'] += 1
+                    yield record
+                if self.offset - released >= RELEASE_BYTES and hasattr(mmap, 'MADV_DONTNEED'):
+                    done = self.offset - self.offset % mmap.PAGESIZE
+                    mm.madvise(mmap.MADV_DONTNEED, released, done - released)
+                    released = done
+
+def read_records_reverse(filepath, block_size=64 * 1024):
+    """Yield the records of a transcript newest first, reading blocks back from EOF
+
+    Stops reading as soon as the caller stops iterating, so fetching the last
+    few messages costs about as much as their size, not the file's.
+    """
+    with open(filepath, 'rb') as f:
+        pos = f.seek(0, os.SEEK_END)
+        carry = None  # end of a line whose beginning lies in an earlier block
+        while pos > 0:
+            size = min(block_size, pos)
+            pos -= size
+            f.seek(pos)
+            chunk = f.read(size)
+            if carry is None:
+                # Drop the unterminated line being written at EOF
+                chunk = chunk[:chunk.rfind(b'\n') + 1]
+                if not chunk:
+                    continue
+                carry = b''
+            lines = (chunk + carry).split(b'\n')
+            carry = lines[0] + b'\n' if pos > 0 else None
+            first = 1 if pos > 0 else 0
+
+            # Offsets of the complete lines in this block, newest first
+            offsets = []
+            line_offset = pos
+            for raw in lines[:-1]:
+                offsets.append(line_offset)
+                line_offset += len(raw) + 1
+            for i in range(len(lines) - 2, first - 1, -1):
+                record = decode_record(lines[i], offsets[i])
+                if record is not None:
+                    yield record
+
+def read_session_header(filepath):
+    """The `session` record from the head of a transcript, or None"""
+    for record in RecordReader(filepath):
+        if isinstance(record, Session):
+            return record.data
+        # The header precedes all messages
+        return None
+    return None
+
+def head_digest(path, length):
+    """Hash of the first `length` bytes of a file"""
+    with open(path, 'rb') as f:
+        return hashlib.sha1(f.read(length)).hexdigest()
+
+def checkpoint(path, stat, offset):
+    """Position of an incremental consumer in a transcript parsed up to `offset`"""
+    head_len = min(offset, HEAD_BYTES)
+    return {
+        'inode': stat.st_ino,
+        'size': stat.st_size,
+        'mtime': stat.st_mtime,
+        'offset': offset,
+        'headLen': head_len,
+        'head': head_digest(path, head_len)
+    }
+
+def resume_offset(entry, path, stat):
+    """Where to continue parsing a file from its checkpoint
+
+    Returns None if the file is unchanged, the checkpoint offset if lines were
+    appended, or 0 if it was truncated or rotated and must be rebuilt.
+    """
+    if entry is None or entry['inode'] != stat.st_ino or entry['offset'] > stat.st_size:
+        return 0
+    # Nothing changed since the last run: no need to open the file
+    if entry['size'] == stat.st_size and entry['mtime'] == stat.st_mtime:
+        return None
+    if head_digest(path, entry['headLen']) != entry['head']:
+        return 0
+    return entry['offset']
+
+class Consumer:
+    """Base class for transcript consumers
+
+    For every session file `plan()` returns the byte offset to start reading
+    from, or None to skip the file. The per-file state returned by `begin()`
+    receives the records through `feed()`, `end()` turns it into a partial
+    result and `merge()` folds that into the consumer. `finish()` writes the
+    outputs once all files are done.
+
+    A consumer that only needs lines containing one of `needles` (bytes)
+    may also be fed Stub records for other message lines.
+    """
+
+    needles = None
+
+    def prepare(self, files):
+        """Called once with the list of (path, stat) before scanning"""
+
+    def plan(self, path, stat):
+        return 0
+
+    def begin(self, path, stat, start):
+        raise NotImplementedError
+
+    def feed(self, state, record):
+        raise NotImplementedError
+
+    def end(self, state, path, stat, offset):
+        return state
+
+    def merge(self, path, partial):
+        pass
+
+    def finish(self):
+        pass
+
+def session_files():
+    """All transcript files with their stat, sorted by name"""
+    files = []
+    for path in sorted(SESSIONS_DIR.glob("*.jsonl")):
+        try:
+            files.append((path, path.stat()))
+        except OSError as e:
+            print(f"Error reading {path}: {e}")
+    return files
+
+def scan_file(path, stat, plans):
+    """Read one file once, feeding every (consumer, start) in `plans`
+
+    Returns the consumers' partial results and the reader's counters.
+    """
+    states = [consumer.begin(path, stat, start) for consumer, start in plans]
+    needles = None
+    if all(consumer.needles for consumer, _ in plans):
+        needles = tuple({n for consumer, _ in plans for n in consumer.needles})
+    first = min(start for _, start in plans)
+    reader = RecordReader(path, first, needles)
+    for record in reader:
+        for (consumer, start), state in zip(plans, states):
+            if record.offset >= start:
+                consumer.feed(state, record)
+    partials = [consumer.end(state, path, stat, max(reader.offset, start))
+                for (consumer, start), state in zip(plans, states)]
+    return partials, {**reader.stats, 'bytes': reader.offset - first}
+
+def _scan_task(consumers, task):
+    """Scan one planned file; returns (partials, stats, None) or (None, None, error)"""
+    path, stat, plans = task
+    try:
+        return (*scan_file(path, stat, [(consumers[i], start) for i, start in plans]), None)
+    except Exception as e:
+        return None, None, e
+
+_worker_consumers = None
+
+def _init_worker(consumers):
+    global _worker_consumers
+    _worker_consumers = consumers
+
+def _worker_scan(task):
+    return _scan_task(_worker_consumers, task)
+
+def run(consumers, workers=1):
+    """Run all consumers over the session files in a single pass
+
+    Returns counters for the run: files found and scanned, bytes and lines
+    read, malformed lines and records decoded.
+    """
+    files = session_files()
+    for consumer in consumers:
+        consumer.prepare(files)
+
+    # Planning stays in this process: consumers may update their own state here
+    tasks = []
+    for path, stat in files:
+        plans = []
+        for i, consumer in enumerate(consumers):
+            start = consumer.plan(path, stat)
+            if start is not None:
+                plans.append((i, start))
+        if plans:
+            tasks.append((path, stat, plans))
+
+    totals = {'files': len(files), 'scanned': 0, 'errors': 0,
+              'bytes': 0, 'lines': 0, 'malformed': 0, 'records': 0}
+    if workers > 1 and len(tasks) > 1:
+        chunksize = max(1, len(tasks) // (workers * 4))
+        with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(consumers,)) as pool:
+            _merge_results(consumers, tasks, pool.map(_worker_scan, tasks, chunksize=chunksize), totals)
+    else:
+        _merge_results(consumers, tasks, (_scan_task(consumers, task) for task in tasks), totals)
+
+    for consumer in consumers:
+        consumer.finish()
+    return totals
+
+def _merge_results(consumers, tasks, results, totals):
+    """Fold per-file partials into the consumers, in file order"""
+    for (path, _, plans), (partials, stats, error) in zip(tasks, results):
+        if error is not None:
+            print(f"Error reading {path}: {error}")
+            totals['errors'] += 1
+            continue
+        totals['scanned'] += 1
+        for key, value in stats.items():
+            totals[key] += value
+        for (i, _), partial in zip(plans, partials):
+            consumers[i].merge(path, partial)
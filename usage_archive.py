@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""
+Columnar archive of every usage record -> .cache/usage-archive/
+
+Each call is one row: timestamp (epoch ms), model and session (codes into
+the dictionaries in meta.json), input/output/cacheRead/cacheWrite tokens and
+cost. Calls without a timestamp are not archived. Every column is a flat
+native-endian array in its own file, so it can be memory-mapped as is.
+
+The archive is append-only. Sessions whose transcript is rebuilt or vanishes
+are dropped by rewriting the columns without their rows into a new
+generation of files. meta.json holds the row count, the dictionaries and
+the current generation and is replaced last, so readers never see rows that
+were not committed.
+
+Queries run as vectorized NumPy operations over the memory-mapped columns
+when NumPy is installed, and as a loop over array.array columns otherwise.
+"""
+
+import heapq
+import json
+import os
+from array import array
+from datetime import datetime, timezone
+from pathlib import Path
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+CACHE_DIR = Path("/home/moltbot/clawd/dashboards/.cache")
+ARCHIVE_DIR = CACHE_DIR / "usage-archive"
+VERSION = 2
+FLUSH_ROWS = 65536  # rows buffered in memory before they are appended to the files
+
+# Column name -> array typecode (also a valid NumPy dtype)
+COLUMNS = {
+    'timestamp': 'q',
+    'model': 'i',
+    'session': 'i',
+    'input': 'q',
+    'output': 'q',
+    'cacheRead': 'q',
+    'cacheWrite': 'q',
+    'cost': 'd',
+}
+TOKEN_COLUMNS = ('input', 'output', 'cacheRead', 'cacheWrite')
+GROUPS = ('model', 'session', 'day', 'hour', 'call')
+BUCKET_MS = {'day': 86400000, 'hour': 3600000}
+BUCKET_FORMAT = {'day': '%Y-%m-%d', 'hour': '%Y-%m-%dT%H'}
+
+def column_path(name, generation):
+    return ARCHIVE_DIR / f"{name}.{generation}"
+
+def new_meta():
+    return {'version': VERSION, 'generation': 0, 'rows': 0, 'models': [], 'sessions': [], 'sessionRows': {}}
+
+def load_meta():
+    """The committed state of the archive, or None if there is none"""
+    try:
+        with open(ARCHIVE_DIR / "meta.json") as f:
+            meta = json.load(f)
+        if meta.get('version') == VERSION:
+            return meta
+    except (OSError, ValueError, AttributeError):
+        pass
+    return None
+
+def save_meta(meta):
+    tmp_path = ARCHIVE_DIR / "meta.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(meta, f, separators=(',', ':'))
+    os.replace(tmp_path, ARCHIVE_DIR / "meta.json")
+
+def to_ms(when):
+    """Aware or naive (UTC) datetime -> epoch milliseconds, None if unknown"""
+    if when is None:
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return int(when.timestamp() * 1000)
+
+class Writer:
+    """Appends calls to the archive; nothing is visible until commit()"""
+
+    def __init__(self):
+        ARCHIVE_DIR.mkdir(parents=True, exist_ok=True)
+        self.meta = load_meta() or new_meta()
+        self.model_codes = {m: i for i, m in enumerate(self.meta['models'])}
+        self.session_codes = {s: i for i, s in enumerate(self.meta['sessions'])}
+        self.dropped = set()
+        self.buffer = {name: array(code) for name, code in COLUMNS.items()}
+        self.written = self.meta['rows']
+        # Discard rows appended by a run that did not commit
+        for name in COLUMNS:
+            with open(column_path(name, self.meta['generation']), 'ab') as f:
+                f.truncate(self.meta['rows'] * array(COLUMNS[name]).itemsize)
+
+    def drop(self, session_ids):
+        """Remove the committed rows of these sessions (applied on commit)"""
+        for session_id in session_ids:
+            if self.meta['sessionRows'].get(session_id):
+                self.dropped.add(self.session_codes[session_id])
+            self.meta['sessionRows'].pop(session_id, None)
+
+    def append(self, session_id, calls):
+        """Add (timestamp_ms, model, input, output, cacheRead, cacheWrite, cost) tuples"""
+        if not calls:
+            return
+        session = self.session_codes.get(session_id)
+        if session is None:
+            session = self.session_codes[session_id] = len(self.meta['sessions'])
+            self.meta['sessions'].append(session_id)
+        buffer = self.buffer
+        for timestamp, model, inp, out, cache_r, cache_w, cost in calls:
+            code = self.model_codes.get(model)
+            if code is None:
+                code = self.model_codes[model] = len(self.meta['models'])
+                self.meta['models'].append(model)
+            buffer['timestamp'].append(timestamp)
+            buffer['model'].append(code)
+            buffer['session'].append(session)
+            buffer['input'].append(int(inp))
+            buffer['output'].append(int(out))
+            buffer['cacheRead'].append(int(cache_r))
+            buffer['cacheWrite'].append(int(cache_w))
+            buffer['cost'].append(float(cost))
+        self.meta['sessionRows'][session_id] = self.meta['sessionRows'].get(session_id, 0) + len(calls)
+        if len(buffer['timestamp']) >= FLUSH_ROWS:
+            self.flush()
+
+    def flush(self):
+        generation = self.meta['generation']
+        for name, values in self.buffer.items():
+            with open(column_path(name, generation), 'ab') as f:
+                values.tofile(f)
+        self.written += len(self.buffer['timestamp'])
+        self.buffer = {name: array(code) for name, code in COLUMNS.items()}
+
+    def compact(self):
+        """Rewrite the columns without the dropped sessions' committed rows"""
+        old, new = self.meta['generation'], self.meta['generation'] + 1
+        committed = self.meta['rows']
+        if np is not None:
+            sessions = np.fromfile(column_path('session', old), dtype='i', count=committed)
+            keep = np.flatnonzero(~np.isin(sessions, list(self.dropped)))
+        else:
+            sessions = array('i')
+            with open(column_path('session', old), 'rb') as f:
+                sessions.fromfile(f, committed)
+            keep = [i for i, s in enumerate(sessions) if s not in self.dropped]
+        kept = len(keep)
+        for name, code in COLUMNS.items():
+            with open(column_path(name, old), 'rb') as f, open(column_path(name, new), 'wb') as out:
+                if np is not None:
+                    values = np.fromfile(f, dtype=code, count=self.written)
+                    values[keep].tofile(out)
+                else:
+                    values = array(code)
+                    values.fromfile(f, self.written)
+                    array(code, (values[i] for i in keep)).tofile(out)
+                values[committed:].tofile(out)
+        self.written = kept + self.written - committed
+        self.meta['rows'] = kept
+        self.meta['generation'] = new
+        self.dropped = set()
+        return old
+
+    def commit(self):
+        self.flush()
+        old = self.compact() if self.dropped else None
+        self.meta['rows'] = self.written
+        save_meta(self.meta)
+        if old is not None:
+            for name in COLUMNS:
+                column_path(name, old).unlink(missing_ok=True)
+
+def read_columns(meta):
+    """The committed columns: NumPy memory maps, or array.array when NumPy is missing"""
+    rows = meta['rows']
+    columns = {}
+    for name, code in COLUMNS.items():
+        path = column_path(name, meta['generation'])
+        if np is not None:
+            columns[name] = np.memmap(path, dtype=code, mode='r', shape=(rows,)) if rows else np.empty(0, code)
+        else:
+            values = array(code)
+            if rows:
+                with open(path, 'rb') as f:
+                    values.fromfile(f, rows)
+            columns[name] = values
+    return columns
+
+def bucket_label(group, key):
+    return datetime.fromtimestamp(key * BUCKET_MS[group] / 1000, timezone.utc).strftime(BUCKET_FORMAT[group])
+
+def summary(calls, inp, out, cache_r, cache_w, cost):
+    return {
+        'calls': int(calls),
+        'inputTokens': int(inp),
+        'outputTokens': int(out),
+        'cacheReadTokens': int(cache_r),
+        'cacheWriteTokens': int(cache_w),
+        'tokens': int(inp) + int(out),
+        'cost': round(float(cost), 6)
+    }
+
+def call_entry(meta, columns, i):
+    return {
+        'timestamp': datetime.fromtimestamp(columns['timestamp'][i] / 1000, timezone.utc).isoformat(timespec='milliseconds').replace('+00:00', 'Z'),
+        'model': meta['models'][columns['model'][i]],
+        'session': meta['sessions'][columns['session'][i]],
+        **summary(1, *(columns[c][i] for c in TOKEN_COLUMNS), columns['cost'][i])
+    }
+
+def query_numpy(meta, columns, group, since, until, model, session, top):
+    ts = columns['timestamp']
+    mask = None
+    for column, test in ((ts, since is not None and (lambda v: v >= since)),
+                         (ts, until is not None and (lambda v: v < until)),
+                         (columns['model'], model is not None and (lambda v: v == model)),
+                         (columns['session'], session is not None and (lambda v: v == session))):
+        if test:
+            mask = test(column) if mask is None else mask & test(column)
+    # Without filters the memory maps are used as they are, without copies
+    selected = columns if mask is None else {name: values[mask] for name, values in columns.items()}
+    totals = summary(len(selected['cost']), *(selected[c].sum() for c in TOKEN_COLUMNS), selected['cost'].sum())
+
+    if group == 'call':
+        # Most expensive calls first, ties in archive order
+        index = np.arange(meta['rows']) if mask is None else np.flatnonzero(mask)
+        cost = -columns['cost'][index]
+        if top < len(index):
+            part = np.argpartition(cost, top - 1)[:top]
+            index, cost = index[part], cost[part]
+        order = np.lexsort((index, cost))
+        return totals, [call_entry(meta, columns, i) for i in index[order]]
+    if group is None or not len(selected['cost']):
+        return totals, []
+
+    # Dense group codes: dictionary codes, or buckets since the earliest call
+    if group in BUCKET_MS:
+        codes = selected['timestamp'] // BUCKET_MS[group]
+        base = int(codes.min())
+        codes = codes - base
+    else:
+        # bincount would convert the int32 codes once per column
+        codes, base = selected[group].astype(np.intp), 0
+    sums = [np.bincount(codes)]
+    sums += [np.bincount(codes, weights=selected[c], minlength=len(sums[0])) for c in TOKEN_COLUMNS + ('cost',)]
+    keys = np.flatnonzero(sums[0])
+    return totals, [(int(key) + base, summary(*(s[key] for s in sums))) for key in keys]
+
+def query_python(meta, columns, group, since, until, model, session, top):
+    ts, models, sessions, cost = columns['timestamp'], columns['model'], columns['session'], columns['cost']
+    tokens = [columns[c] for c in TOKEN_COLUMNS]
+    step = BUCKET_MS.get(group)
+    sums = {}
+    totals = [0] * 6
+    calls = []
+    for i in range(meta['rows']):
+        if ((since is not None and ts[i] < since) or (until is not None and ts[i] >= until)
+                or (model is not None and models[i] != model) or (session is not None and sessions[i] != session)):
+            continue
+        row = (1, tokens[0][i], tokens[1][i], tokens[2][i], tokens[3][i], cost[i])
+        for k in range(6):
+            totals[k] += row[k]
+        if group == 'call':
+            calls.append(i)
+        elif group is not None:
+            key = ts[i] // step if step else columns[group][i]
+            entry = sums.get(key)
+            if entry is None:
+                sums[key] = list(row)
+            else:
+                for k in range(6):
+                    entry[k] += row[k]
+    if group == 'call':
+        # Most expensive calls first, ties in archive order
+        top_calls = heapq.nsmallest(top, calls, key=lambda i: (-cost[i], i))
+        return summary(*totals), [call_entry(meta, columns, i) for i in top_calls]
+    return summary(*totals), [(key, summary(*entry)) for key, entry in sorted(sums.items())]
+
+def query(group='model', since=None, until=None, model=None, session_id=None, top=None):
+    """Aggregate the archived calls
+
+    `group` is 'model', 'session', 'day', 'hour', 'call' (the `top` most
+    expensive calls) or None for totals only; `since`/`until` are epoch ms.
+    Model and session groups are ordered by cost and cut to `top`, time
+    buckets are in order.
+    """
+    if group not in GROUPS and group is not None:
+        raise ValueError(f"Unknown group: {group}")
+    meta = load_meta() or new_meta()
+    result = {'group': group, 'engine': 'numpy' if np is not None else 'array', 'archived': meta['rows']}
+
+    # Filters on values missing from the dictionaries match nothing
+    model_code = meta['models'].index(model) if model in meta['models'] else -1
+    session_code = meta['sessions'].index(session_id) if session_id in meta['sessions'] else -1
+    if group == 'call':
+        top = top or 10
+    run = query_numpy if np is not None else query_python
+    totals, groups = run(meta, read_columns(meta), group, since, until,
+                         model_code if model is not None else None,
+                         session_code if session_id is not None else None, top)
+
+    result['totals'] = totals
+    if group in ('model', 'session'):
+        names = meta['models'] if group == 'model' else meta['sessions']
+        groups = [{group: names[key], **entry} for key, entry in sorted(groups, key=lambda x: -x[1]['cost'])][:top]
+    elif group in BUCKET_MS:
+        groups = [{'bucket': bucket_label(group, key), **entry} for key, entry in groups]
+    result['groups'] = groups
+    return result